@@ -5,23 +5,50 @@ Avatar video streams via WebRTC directly to browser; audio and events are relaye
 """
 
 import asyncio
-import json
+import hashlib
+import importlib.util
 import logging
 import os
+import sys
+import time
 from contextlib import asynccontextmanager
-from typing import Dict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
+import orjson
 import uvicorn
-from azure.core.credentials import AzureKeyCredential
+from azure.core.credentials import AccessToken, AzureKeyCredential
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 
+# Load .env before importing voice_handler, which reads defaults at import
+load_dotenv()
+
 from voice_handler import VoiceSessionHandler
 
-load_dotenv()
+try:
+    from azure.identity.aio import DefaultAzureCredential
+except ImportError:
+    DefaultAzureCredential = None
+
+# Raw ASGI callables used by the WebSocket endpoint
+ASGIReceive = Callable[[], Awaitable[Dict[str, Any]]]
+ASGISend = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Environment defaults, resolved once at import
+DEFAULT_MODEL = os.getenv("VOICELIVE_MODEL", "gpt-4o-realtime")
+DEFAULT_VOICE = os.getenv("VOICELIVE_VOICE", "en-US-AvaMultilingualNeural")
+DEFAULT_ENDPOINT = os.getenv("AZURE_VOICELIVE_ENDPOINT", "")
+DEFAULT_API_KEY = os.getenv("AZURE_VOICELIVE_API_KEY", "")
+
+_CONFIG_RESPONSE = {
+    "model": DEFAULT_MODEL,
+    "voice": DEFAULT_VOICE,
+    "endpoint": DEFAULT_ENDPOINT,
+    "hasApiKey": bool(DEFAULT_API_KEY),
+}
 
 # Logging with color
 class ColorFormatter(logging.Formatter):
@@ -38,16 +65,34 @@ class ColorFormatter(logging.Formatter):
     DIM = "\033[2m"
     WHITE = "\033[97m"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Color-wrapped level names, built once instead of per record
+        self._level_prefix = {
+            level: f"{color}{self.BOLD}{logging.getLevelName(level):<8}{self.RESET} "
+            for level, color in self.COLORS.items()
+        }
+
     def format(self, record):
-        color = self.COLORS.get(record.levelno, self.RESET)
         # Timestamp in dim, level in color+bold, name in dim, message in white
-        timestamp = self.formatTime(record, self.datefmt)
-        return (
-            f"{self.DIM}{timestamp}{self.RESET} "
-            f"{color}{self.BOLD}{record.levelname:<8}{self.RESET} "
-            f"{self.DIM}{record.name}{self.RESET} "
-            f"{self.WHITE}{record.getMessage()}{self.RESET}"
-        )
+        level = self._level_prefix.get(record.levelno)
+        if level is None:
+            level = f"{self.RESET}{self.BOLD}{record.levelname:<8}{self.RESET} "
+        if self.datefmt:
+            timestamp = time.strftime(self.datefmt, time.localtime(record.created))
+        else:
+            timestamp = "%s,%03d" % (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.created)), record.msecs)
+        return "".join((
+            self.DIM, timestamp, self.RESET, " ",
+            level,
+            self.DIM, record.name, self.RESET, " ",
+            self.WHITE, record.getMessage(), self.RESET,
+        ))
+
+# ColorFormatter never prints thread/process info; skip collecting it per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 
 handler = logging.StreamHandler()
 handler.setFormatter(ColorFormatter())
@@ -57,9 +102,55 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Track active sessions per client
-active_sessions: Dict[str, VoiceSessionHandler] = {}
+# Track active sessions per client, sharded by client_id hash so each
+# per-shard dict stays small under connect/disconnect churn
+SESSION_SHARDS = 16
+_session_shards: List[Dict[str, VoiceSessionHandler]] = [{} for _ in range(SESSION_SHARDS)]
 active_tasks: Dict[str, asyncio.Task] = {}
+active_writers: Dict[str, asyncio.Task] = {}
+
+# Outbound messages buffered per client before the writer task sends them
+OUTBOUND_QUEUE_SIZE = 256
+
+# Limit concurrent WebSocket sessions; each one holds a Voice Live connection
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "200"))
+_session_count = 0
+
+# Type tag of binary audio frames sent by the browser (same tag is used
+# for assistant audio in the other direction, see voice_handler)
+WS_FRAME_AUDIO = b"\x01"
+# First byte of outbound frames that are dropped rather than waited on when a
+# slow browser lets the outbound queue fill up. Only audio: video frames are
+# fMP4 fragments appended to one SourceBuffer, so losing one stalls playback
+_DROPPABLE_TAGS = frozenset({WS_FRAME_AUDIO[0]})
+# Upper bound on buffered audio frames merged into one SDK append
+AUDIO_COALESCE_MAX_FRAMES = 32
+
+# Pre-serialized session_error frames for fixed error messages
+_ERR_AT_CAPACITY = orjson.dumps({
+    "type": "session_error",
+    "error": "Server at capacity. Please try again later.",
+})
+_ERR_NO_ENDPOINT = orjson.dumps({
+    "type": "session_error",
+    "error": "Azure AI Services Endpoint is required. Provide it in the UI or set AZURE_VOICELIVE_ENDPOINT.",
+})
+_ERR_NO_CREDENTIALS = orjson.dumps({
+    "type": "session_error",
+    "error": "No credentials provided. Enter Subscription Key or Entra Token in the UI.",
+})
+
+
+def _get_session(client_id: str) -> Optional[VoiceSessionHandler]:
+    return _session_shards[hash(client_id) & (SESSION_SHARDS - 1)].get(client_id)
+
+
+def _set_session(client_id: str, handler: VoiceSessionHandler):
+    _session_shards[hash(client_id) & (SESSION_SHARDS - 1)][client_id] = handler
+
+
+def _pop_session(client_id: str) -> Optional[VoiceSessionHandler]:
+    return _session_shards[hash(client_id) & (SESSION_SHARDS - 1)].pop(client_id, None)
 
 
 @asynccontextmanager
@@ -67,12 +158,14 @@ async def lifespan(app: FastAPI):
     logger.info("Voice Live Avatar server starting...")
     yield
     # Cleanup all sessions on shutdown
-    for client_id in list(active_sessions.keys()):
-        handler = active_sessions.get(client_id)
-        if handler:
+    for shard in _session_shards:
+        for handler in list(shard.values()):
             await handler.stop()
-    active_sessions.clear()
+        shard.clear()
+    for writer in active_writers.values():
+        writer.cancel()
     active_tasks.clear()
+    active_writers.clear()
     logger.info("Voice Live Avatar server stopped.")
 
 
@@ -83,24 +176,80 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# CORS applies to API routes only; static assets are served same-origin.
+# ALLOWED_ORIGINS is a comma-separated list; "*" allows any origin.
+ALLOWED_ORIGINS = frozenset(
+    origin.strip() for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",") if origin.strip()
+)
+_CORS_ALLOW_ANY = "*" in ALLOWED_ORIGINS
+
+
+def _is_cors_path(path: str) -> bool:
+    return path == "/health" or path.startswith("/api/")
+
+
+class _ApiCORSMiddleware:
+    """Run Starlette's CORSMiddleware for API routes and pass everything else through."""
+
+    def __init__(self, app, **options):
+        self.app = app
+        self.cors = CORSMiddleware(app, **options)
+
+    async def __call__(self, scope: dict, receive: ASGIReceive, send: ASGISend):
+        if scope["type"] == "http" and _is_cors_path(scope["path"]):
+            await self.cors(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    _ApiCORSMiddleware,
+    allow_origins=list(ALLOWED_ORIGINS),
+    # Credentials are never combined with an allow-any origin
+    allow_credentials=not _CORS_ALLOW_ANY,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=600,
 )
 
 
+# Static assets and their content hashes, computed once at startup.
+# Restart the server after editing files in ./static/ to refresh them.
+static_path = os.path.join(os.path.dirname(__file__), "static")
+
+
+def _compute_static_etags(root: str) -> Dict[str, str]:
+    """Map each static file's URL path to a quoted content-hash ETag."""
+    etags: Dict[str, str] = {}
+    if not os.path.isdir(root):
+        return etags
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            full_path = os.path.join(dirpath, name)
+            url_path = "/" + os.path.relpath(full_path, root).replace(os.sep, "/")
+            with open(full_path, "rb") as f:
+                etags[url_path] = '"%s"' % hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    if "/index.html" in etags:
+        etags["/"] = etags["/index.html"]
+    return etags
+
+
+_STATIC_ETAGS = _compute_static_etags(static_path)
+
+
 @app.middleware("http")
-async def no_cache_static(request, call_next):
-    """Disable caching for static assets during development."""
+async def static_etag(request, call_next):
+    """Revalidate static assets by ETag and answer 304 when unchanged."""
+    etag = _STATIC_ETAGS.get(request.url.path)
+    if etag is None:
+        return await call_next(request)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
     response = await call_next(request)
-    path = request.url.path
-    if path.endswith((".js", ".css", ".html")) or path == "/":
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
+    response.headers.update(headers)
     return response
 
 
@@ -112,123 +261,203 @@ async def health_check():
 @app.get("/api/config")
 async def get_config():
     """Return default configuration to the frontend."""
-    return {
-        "model": os.getenv("VOICELIVE_MODEL", "gpt-4o-realtime"),
-        "voice": os.getenv("VOICELIVE_VOICE", "en-US-AvaMultilingualNeural"),
-        "endpoint": os.getenv("AZURE_VOICELIVE_ENDPOINT", ""),
-        "hasApiKey": bool(os.getenv("AZURE_VOICELIVE_API_KEY")),
-    }
+    return _CONFIG_RESPONSE
+
+
+async def websocket_endpoint(scope: dict, receive: ASGIReceive, send: ASGISend):
+    """Main WebSocket endpoint for voice session communication.
+
+    Runs as a raw ASGI app: frames are read from ``receive`` and written
+    with ``send`` directly instead of through a Starlette WebSocket.
+    """
+    global _session_count
+    client_id = scope["path_params"]["client_id"]
+
+    if (await receive())["type"] != "websocket.connect":
+        return
+    await send({"type": "websocket.accept"})
 
+    # Checked and claimed with no await in between, so no lock is needed
+    if _session_count >= MAX_SESSIONS:
+        logger.warning(f"Rejecting client {client_id}: server at capacity ({MAX_SESSIONS} sessions)")
+        await send_ws_message(send, _ERR_AT_CAPACITY)
+        await send({"type": "websocket.close", "code": 1013})
+        return
+    _session_count += 1
 
-@app.websocket("/ws/{client_id}")
-async def websocket_endpoint(websocket: WebSocket, client_id: str):
-    """Main WebSocket endpoint for voice session communication."""
-    await websocket.accept()
     logger.info(f"Client {client_id} connected")
 
+    # Read-ahead receive left over from audio coalescing, consumed next
+    pending: Optional[asyncio.Future] = None
     try:
         while True:
-            data = await websocket.receive_text()
-            message = json.loads(data)
-            await handle_message(client_id, message, websocket)
-    except WebSocketDisconnect:
-        logger.info(f"Client {client_id} disconnected")
+            if pending is not None:
+                frame = await pending
+                pending = None
+            else:
+                frame = await receive()
+            if frame["type"] == "websocket.disconnect":
+                logger.info(f"Client {client_id} disconnected")
+                break
+            raw = frame.get("bytes")
+            if raw is not None:
+                # Binary frames carry raw PCM16 audio behind a 1-byte type tag
+                if raw[:1] == WS_FRAME_AUDIO:
+                    audio, pending = await _coalesce_audio(raw, receive)
+                    handler = _get_session(client_id)
+                    if handler:
+                        await handler.send_audio_bytes(audio)
+                else:
+                    logger.warning("Unknown binary frame type from %s", client_id)
+                continue
+            message = orjson.loads(frame["text"])
+            await handle_message(client_id, message, send)
     except Exception as e:
         logger.error(f"WebSocket error for {client_id}: {e}")
     finally:
+        if pending is not None:
+            pending.cancel()
         await cleanup_client(client_id)
-
-
-async def handle_message(client_id: str, message: dict, websocket: WebSocket):
+        _session_count -= 1
+
+
+async def _coalesce_audio(
+    first: bytes, receive: ASGIReceive
+) -> Tuple[Union[bytes, memoryview], Optional[asyncio.Future]]:
+    """Merge audio frames that are already buffered behind ``first``.
+
+    Each extra receive gets one scheduler pass; if it has not completed by
+    then (nothing buffered) or yields a non-audio frame, it is returned as
+    the pending read for the caller to consume next.
+    """
+    chunks = [memoryview(first)[1:]]
+    pending: Optional[asyncio.Future] = None
+    while len(chunks) < AUDIO_COALESCE_MAX_FRAMES:
+        pending = asyncio.ensure_future(receive())
+        await asyncio.sleep(0)
+        if not pending.done() or pending.exception() is not None:
+            break
+        frame = pending.result()
+        raw = frame.get("bytes")
+        if frame["type"] != "websocket.receive" or raw is None or raw[:1] != WS_FRAME_AUDIO:
+            break
+        chunks.append(memoryview(raw)[1:])
+        pending = None
+    audio = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    return audio, pending
+
+
+class _RawWebSocketRoute:
+    """Wrap an ASGI coroutine so Starlette routes to it without a WebSocket object."""
+
+    def __init__(self, endpoint: Callable[[dict, ASGIReceive, ASGISend], Awaitable[None]]):
+        self.endpoint = endpoint
+
+    async def __call__(self, scope: dict, receive: ASGIReceive, send: ASGISend):
+        await self.endpoint(scope, receive, send)
+
+
+app.add_websocket_route("/ws/{client_id}", _RawWebSocketRoute(websocket_endpoint))
+
+
+# Session message handlers, keyed by interned message type
+_SESSION_HANDLERS = {
+    sys.intern(msg_type): fn
+    for msg_type, fn in {
+        "audio_chunk": lambda h, m: h.send_audio(m.get("data", "")),
+        "send_text": lambda h, m: h.send_text_message(m.get("text", "")),
+        "avatar_sdp_offer": lambda h, m: h.send_avatar_sdp_offer(m.get("clientSdp", "")),
+        "interrupt": lambda h, m: h.interrupt(),
+        "update_scene": lambda h, m: h.update_avatar_scene(m.get("avatar", {})),
+    }.items()
+}
+
+
+async def handle_message(client_id: str, message: dict, send: ASGISend):
     """Route incoming WebSocket messages."""
     msg_type = message.get("type")
+    logger.debug("Client %s message %s", client_id, msg_type)
 
-    if msg_type == "start_session":
-        await start_session(client_id, message.get("config", {}), websocket)
-
-    elif msg_type == "stop_session":
-        await stop_session(client_id)
-
-    elif msg_type == "audio_chunk":
-        handler = active_sessions.get(client_id)
+    fn = _SESSION_HANDLERS.get(msg_type)
+    if fn is not None:
+        handler = _get_session(client_id)
         if handler:
-            await handler.send_audio(message.get("data", ""))
+            await fn(handler, message)
 
-    elif msg_type == "send_text":
-        handler = active_sessions.get(client_id)
-        if handler:
-            await handler.send_text_message(message.get("text", ""))
+    elif msg_type == "start_session":
+        await start_session(client_id, message.get("config", {}), send)
 
-    elif msg_type == "avatar_sdp_offer":
-        handler = active_sessions.get(client_id)
-        if handler:
-            await handler.send_avatar_sdp_offer(message.get("clientSdp", ""))
-
-    elif msg_type == "interrupt":
-        handler = active_sessions.get(client_id)
-        if handler:
-            await handler.interrupt()
-
-    elif msg_type == "update_scene":
-        handler = active_sessions.get(client_id)
-        if handler:
-            await handler.update_avatar_scene(message.get("avatar", {}))
+    elif msg_type == "stop_session":
+        await stop_session(client_id)
 
     else:
-        logger.warning(f"Unknown message type: {msg_type}")
+        logger.warning("Unknown message type: %s", msg_type)
 
 
-async def start_session(client_id: str, config: dict, websocket: WebSocket):
+async def start_session(client_id: str, config: dict, send: ASGISend):
     """Start a new Voice Live session for a client."""
-    # Clean up any existing session
-    await cleanup_client(client_id)
+    # Clean up any existing session (skipped on first connect)
+    if _get_session(client_id) or client_id in active_tasks or client_id in active_writers:
+        await cleanup_client(client_id)
 
     # Prefer credentials from frontend config, fall back to env vars
-    endpoint = config.get("endpoint", "").strip() or os.getenv("AZURE_VOICELIVE_ENDPOINT", "")
-    api_key = config.get("apiKey", "").strip() or os.getenv("AZURE_VOICELIVE_API_KEY", "")
+    endpoint = config.get("endpoint", "").strip() or DEFAULT_ENDPOINT
+    api_key = config.get("apiKey", "").strip() or DEFAULT_API_KEY
     entra_token = config.get("entraToken", "").strip()
 
     if not endpoint:
-        await send_ws_message(websocket, {
-            "type": "session_error",
-            "error": "Azure AI Services Endpoint is required. Provide it in the UI or set AZURE_VOICELIVE_ENDPOINT.",
-        })
+        await send_ws_message(send, _ERR_NO_ENDPOINT)
         return
 
     # Create credential: prefer Entra token (for agent modes), then API key, then DefaultAzureCredential
     if entra_token:
-        from azure.core.credentials import AccessToken
-        import time
-
-        class _StaticTokenCredential:
-            """Wraps a raw token string as an async TokenCredential."""
-            def __init__(self, token: str):
-                self._token = token
-            async def get_token(self, *scopes, **kwargs):
-                return AccessToken(self._token, int(time.time()) + 3600)
-            async def close(self): pass
-            async def __aenter__(self): return self
-            async def __aexit__(self, *args): pass
-
         credential = _StaticTokenCredential(entra_token)
     elif api_key:
         credential = AzureKeyCredential(api_key)
+    elif DefaultAzureCredential is not None:
+        credential = DefaultAzureCredential()
     else:
+        await send_ws_message(send, _ERR_NO_CREDENTIALS)
+        return
+
+    # Queue outbound messages so bursts from the session never block the
+    # receive loop; a dedicated writer task drains the queue to the socket.
+    out_queue: asyncio.Queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+
+    dropped = 0
+
+    async def send_message(msg: Union[dict, bytes]):
+        # Never let a stalled browser block the Voice Live receive loop on
+        # audio; video and control messages still wait for room
+        nonlocal dropped
         try:
-            from azure.identity.aio import DefaultAzureCredential
-            credential = DefaultAzureCredential()
-        except ImportError:
-            await send_ws_message(websocket, {
-                "type": "session_error",
-                "error": "No credentials provided. Enter Subscription Key or Entra Token in the UI.",
-            })
-            return
-
-    async def send_message(msg: dict):
-        try:
-            await websocket.send_text(json.dumps(msg))
-        except Exception as e:
-            logger.error(f"Error sending to {client_id}: {e}")
+            out_queue.put_nowait(msg)
+        except asyncio.QueueFull:
+            if isinstance(msg, bytes) and msg and msg[0] in _DROPPABLE_TAGS:
+                dropped += 1
+                if dropped == 1 or dropped % 100 == 0:
+                    logger.warning("Outbound queue full for %s, dropped %d audio frames", client_id, dropped)
+                return
+            await out_queue.put(msg)
+
+    async def writer():
+        while True:
+            batch = [await out_queue.get()]
+            while not out_queue.empty():
+                batch.append(out_queue.get_nowait())
+            try:
+                for msg in batch:
+                    await send({
+                        "type": "websocket.send",
+                        "bytes": msg if isinstance(msg, bytes) else orjson.dumps(msg),
+                    })
+            except Exception as e:
+                # The socket is gone; the rest of the queue would fail the
+                # same way, and the endpoint's cleanup ends the session
+                logger.error("Error sending to %s: %s", client_id, e)
+                return
+
+    active_writers[client_id] = asyncio.create_task(writer())
 
     handler = VoiceSessionHandler(
         client_id=client_id,
@@ -237,7 +466,7 @@ async def start_session(client_id: str, config: dict, websocket: WebSocket):
         send_message=send_message,
         config=config,
     )
-    active_sessions[client_id] = handler
+    _set_session(client_id, handler)
 
     # Run session in background task
     task = asyncio.create_task(handler.start())
@@ -245,6 +474,30 @@ async def start_session(client_id: str, config: dict, websocket: WebSocket):
     logger.info(f"Session started for {client_id}")
 
 
+class _StaticTokenCredential:
+    """Wraps a raw token string as an async TokenCredential."""
+
+    # Refresh the reported expiry once less than this many seconds remain
+    _REFRESH_MARGIN_S = 300
+    _LIFETIME_S = 3600
+
+    def __init__(self, token: str):
+        self._token = token
+        self._expires_on = int(time.time()) + self._LIFETIME_S
+        self._cached = AccessToken(token, self._expires_on)
+
+    async def get_token(self, *scopes, **kwargs):
+        now = int(time.time())
+        if self._expires_on - now < self._REFRESH_MARGIN_S:
+            self._expires_on = now + self._LIFETIME_S
+            self._cached = AccessToken(self._token, self._expires_on)
+        return self._cached
+
+    async def close(self): pass
+    async def __aenter__(self): return self
+    async def __aexit__(self, *args): pass
+
+
 async def stop_session(client_id: str):
     """Stop an active session."""
     await cleanup_client(client_id)
@@ -252,11 +505,16 @@ async def stop_session(client_id: str):
 
 async def cleanup_client(client_id: str):
     """Clean up session and task for a client."""
-    handler = active_sessions.pop(client_id, None)
+    handler = _pop_session(client_id)
     if handler:
         await handler.stop()
 
-    task = active_tasks.pop(client_id, None)
+    await _cancel_task(active_tasks.pop(client_id, None))
+    await _cancel_task(active_writers.pop(client_id, None))
+
+
+async def _cancel_task(task: Optional[asyncio.Task]):
+    """Cancel a background task and wait for it to finish."""
     if task and not task.done():
         task.cancel()
         try:
@@ -265,16 +523,23 @@ async def cleanup_client(client_id: str):
             pass
 
 
-async def send_ws_message(websocket: WebSocket, message: dict):
-    """Send a JSON message via WebSocket."""
+def precompiled_message(message: dict) -> bytes:
+    """Serialize a message once so the same frame can be sent to many clients."""
+    return orjson.dumps(message)
+
+
+async def send_ws_message(send: ASGISend, message: Union[dict, bytes]):
+    """Send a JSON message (or a precompiled_message frame) via WebSocket."""
     try:
-        await websocket.send_text(json.dumps(message))
+        await send({
+            "type": "websocket.send",
+            "bytes": message if isinstance(message, bytes) else orjson.dumps(message),
+        })
     except Exception as e:
-        logger.error(f"Error sending WebSocket message: {e}")
+        logger.error("Error sending WebSocket message: %s", e)
 
 
 # Mount static files (frontend)
-static_path = os.path.join(os.path.dirname(__file__), "static")
 if os.path.exists(static_path):
     app.mount("/", StaticFiles(directory=static_path, html=True), name="static")
 else:
@@ -283,5 +548,32 @@ else:
         return {"message": "Voice Live Avatar - static files not found. Place frontend in ./static/"}
 
 
+# uvloop is not available on Windows; fall back to the stdlib event loop there
+EVENT_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+# Bound buffered inbound frames per connection so a fast client is pushed
+# back through TCP flow control instead of growing server memory
+WS_MAX_QUEUE = 16
+WS_MAX_SIZE = 2**20
+
+
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=3000, reload=True, log_level="info")
+    # DEV_RELOAD=1 restarts on code changes (single process); otherwise run
+    # one worker per CPU. Sessions live on the worker that owns the socket.
+    if os.getenv("DEV_RELOAD"):
+        process_options = {"reload": True}
+    else:
+        process_options = {"workers": int(os.getenv("WORKERS", os.cpu_count() or 1))}
+
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=3000,
+        log_level="info",
+        **process_options,
+        loop=EVENT_LOOP,
+        http="httptools",
+        ws="websockets",
+        ws_max_queue=WS_MAX_QUEUE,
+        ws_max_size=WS_MAX_SIZE,
+    )
@@ -40,6 +40,12 @@ let videoChunksQueue = [];
 let pendingWsVideoElement = null;
 
 const clientId = 'client-' + Math.random().toString(36).substr(2, 9);
+// Server sends JSON messages as UTF-8 binary frames; media frames start
+// with a 1-byte type tag instead of '{'
+const wsTextDecoder = new TextDecoder();
+// Type tags for binary media frames (audio is used in both directions)
+const WS_FRAME_AUDIO = 0x01;
+const WS_FRAME_VIDEO = 0x02;
 
 // ===== DOM Ready =====
 document.addEventListener('DOMContentLoaded', () => {
@@ -410,6 +416,7 @@ async function connectSession() {
         // Open WebSocket to Python backend
         const protocol = location.protocol === 'https:' ? 'wss:' : 'ws:';
         ws = new WebSocket(`${protocol}//${location.host}/ws/${clientId}`);
+        ws.binaryType = 'arraybuffer';
 
         ws.onopen = () => {
             const config = gatherConfig();
@@ -424,7 +431,19 @@ async function connectSession() {
         };
 
         ws.onmessage = (event) => {
-            const msg = JSON.parse(event.data);
+            if (typeof event.data !== 'string') {
+                const tag = new Uint8Array(event.data, 0, 1)[0];
+                if (tag === WS_FRAME_AUDIO) {
+                    playAudioPcm16(event.data.slice(1));
+                    return;
+                }
+                if (tag === WS_FRAME_VIDEO) {
+                    enqueueVideoChunk(event.data.slice(1));
+                    return;
+                }
+            }
+            const raw = typeof event.data === 'string' ? event.data : wsTextDecoder.decode(event.data);
+            const msg = JSON.parse(raw);
             handleServerMessage(msg);
         };
 
@@ -914,12 +933,15 @@ registerProcessor('pcm16-processor', PCM16Processor);
 
         workletNode.port.onmessage = (e) => {
             if (!isConnected || !isRecording || !ws || ws.readyState !== WebSocket.OPEN) return;
-            const base64 = arrayBufferToBase64(e.data);
+            // Binary frame: 1-byte type tag followed by raw PCM16 samples
+            const frame = new Uint8Array(e.data.byteLength + 1);
+            frame[0] = WS_FRAME_AUDIO;
+            frame.set(new Uint8Array(e.data), 1);
             audioChunksSent++;
             if (audioChunksSent <= 3 || audioChunksSent % 100 === 0) {
-                console.log(`[Audio] Sending chunk #${audioChunksSent}, size=${base64.length}`);
+                console.log(`[Audio] Sending chunk #${audioChunksSent}, size=${e.data.byteLength}`);
             }
-            ws.send(JSON.stringify({ type: 'audio_chunk', data: base64 }));
+            ws.send(frame);
         };
 
         source.connect(workletNode);
@@ -953,6 +975,11 @@ function stopAudioCapture() {
 // ===== Audio Playback (24kHz PCM16) =====
 function handleAudioDelta(base64Data) {
     if (!base64Data) return;
+    playAudioPcm16(base64ToArrayBuffer(base64Data));
+}
+
+function playAudioPcm16(arrayBuffer) {
+    if (!arrayBuffer.byteLength) return;
     if (!playbackContext) {
         playbackContext = new AudioContext({ sampleRate: 24000 });
         // Create analyser for volume visualization
@@ -963,7 +990,6 @@ function handleAudioDelta(base64Data) {
         analyserNode.connect(playbackContext.destination);
         nextPlaybackTime = 0;
     }
-    const arrayBuffer = base64ToArrayBuffer(base64Data);
     const int16 = new Int16Array(arrayBuffer);
     const float32 = new Float32Array(int16.length);
     for (let i = 0; i < int16.length; i++) {
@@ -1148,24 +1174,23 @@ let videoChunkCount = 0;
 
 function handleVideoChunk(base64Data) {
     if (!base64Data) return;
-    videoChunkCount++;
-    if (videoChunkCount <= 5 || videoChunkCount % 100 === 0) {
-        console.log(`[VIDEO] chunk #${videoChunkCount}, length=${base64Data.length}, mediaSource=${mediaSource?.readyState}, sourceBuffer=${!!sourceBuffer}`);
-    }
     try {
-        const binaryString = atob(base64Data);
-        const arrayBuffer = new ArrayBuffer(binaryString.length);
-        const bytes = new Uint8Array(arrayBuffer);
-        for (let i = 0; i < binaryString.length; i++) {
-            bytes[i] = binaryString.charCodeAt(i);
-        }
-        videoChunksQueue.push(arrayBuffer);
-        processVideoChunkQueue();
+        enqueueVideoChunk(base64ToArrayBuffer(base64Data));
     } catch (e) {
         console.error('Error handling video chunk:', e);
     }
 }
 
+function enqueueVideoChunk(arrayBuffer) {
+    if (!arrayBuffer.byteLength) return;
+    videoChunkCount++;
+    if (videoChunkCount <= 5 || videoChunkCount % 100 === 0) {
+        console.log(`[VIDEO] chunk #${videoChunkCount}, bytes=${arrayBuffer.byteLength}, mediaSource=${mediaSource?.readyState}, sourceBuffer=${!!sourceBuffer}`);
+    }
+    videoChunksQueue.push(arrayBuffer);
+    processVideoChunkQueue();
+}
+
 function processVideoChunkQueue() {
     if (!sourceBuffer || sourceBuffer.updating || !mediaSource || mediaSource.readyState !== 'open') {
         return;
@@ -1481,15 +1506,6 @@ function onSpeechStopped() {
 }
 
 // ===== Utilities =====
-function arrayBufferToBase64(buffer) {
-    const bytes = new Uint8Array(buffer);
-    let binary = '';
-    for (let i = 0; i < bytes.byteLength; i++) {
-        binary += String.fromCharCode(bytes[i]);
-    }
-    return btoa(binary);
-}
-
 function base64ToArrayBuffer(base64) {
     const binary = atob(base64);
     const len = binary.length;
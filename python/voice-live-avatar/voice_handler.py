@@ -4,13 +4,21 @@ Manages Azure Voice Live SDK sessions with avatar support.
 Handles audio streaming, avatar WebRTC signaling, and event processing.
 """
 
+import ast
 import asyncio
-import json
 import logging
 import base64
+import binascii
+import math
+import operator
 import os
-from typing import Any, Callable, Optional
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Union
 
+import orjson
 from azure.ai.voicelive.aio import connect
 from azure.ai.voicelive.models import (
     AvatarConfig,
@@ -37,15 +45,218 @@ from azure.ai.voicelive.models import (
     VideoResolution,
 )
 
+try:
+    # SIMD-accelerated base64; falls back to the stdlib codec when unavailable
+    from pybase64 import b64encode_as_string
+except ImportError:
+    def b64encode_as_string(data) -> str:
+        return base64.b64encode(data).decode("ascii")
+
 logger = logging.getLogger(__name__)
 
+# Environment defaults, resolved once at import (app.py loads .env first)
+_DEFAULT_MODEL = os.getenv("VOICELIVE_MODEL", "gpt-4o-realtime")
+_DEFAULT_VOICE = os.getenv("VOICELIVE_VOICE", "en-US-AvaMultilingualNeural")
+# DEBUG_VERBOSE=1 includes full event/payload dumps in the debug logs
+_DEBUG_VERBOSE = os.getenv("DEBUG_VERBOSE") == "1"
+
+# High-rate server events: not logged on receipt, and corked instead of
+# being relayed one by one
+_HIGH_RATE_EVENTS = frozenset({
+    ServerEventType.RESPONSE_AUDIO_DELTA,
+    ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA,
+    "response.video.delta",
+})
+
+# Arithmetic operators allowed by the calculate tool
+_CALC_BINOPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_CALC_UNARYOPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+@lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.expr:
+    """Parse an arithmetic expression once; repeated tool calls hit the cache."""
+    return ast.parse(expression, mode="eval").body
+
+
+def _safe_eval(node: ast.expr):
+    """Evaluate a parsed arithmetic expression, rejecting anything else."""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _CALC_BINOPS:
+        return _CALC_BINOPS[type(node.op)](_safe_eval(node.left), _safe_eval(node.right))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _CALC_UNARYOPS:
+        return _CALC_UNARYOPS[type(node.op)](_safe_eval(node.operand))
+    raise ValueError(f"Unsupported expression: {ast.dump(node)}")
+
+
+@lru_cache(maxsize=32)
+def _rate_str(speed: float) -> str:
+    """Canonical speaking-rate string for a voice speed (1.0 -> "1")."""
+    return f"{float(speed):g}"
+
+
+# Session settings with fixed arguments, built once and shared by every
+# session (the SDK only serializes them; never mutate these)
+_DEFAULT_SERVER_VAD = ServerVad(threshold=0.3, prefix_padding_ms=300, silence_duration_ms=500)
+_SEMANTIC_EOU_DETECTION = AzureSemanticDetection(threshold_level="default", timeout_ms=1000)
+_NOISE_REDUCTION = {"type": "azure_deep_noise_suppression"}
+_ECHO_CANCELLATION = {"type": "server_echo_cancellation"}
+
+# Function results whose top-level values are larger than this (in
+# characters or items) are serialized off the event loop
+_RESULT_OFFLOAD_SIZE = 4096
+
+
+def _is_large_result(result: dict) -> bool:
+    """Cheap size estimate that avoids serializing just to measure."""
+    if not isinstance(result, dict):
+        return False
+    return any(
+        isinstance(value, (str, bytes, list, dict)) and len(value) > _RESULT_OFFLOAD_SIZE
+        for value in result.values()
+    )
+
+
+# Photo avatar scene scaling: percent -> fraction, degrees -> radians
+_INV_100 = 0.01
+_DEG2RAD = math.pi / 180.0
+
+# Event sets passed to _wait_for_event
+_WAIT_SESSION_UPDATED = frozenset({ServerEventType.SESSION_UPDATED})
+_WAIT_FUNCTION_ARGS_DONE = frozenset({ServerEventType.RESPONSE_FUNCTION_CALL_ARGUMENTS_DONE})
+_WAIT_RESPONSE_DONE = frozenset({ServerEventType.RESPONSE_DONE})
+
+# Window for merging consecutive audio/video deltas into one browser message
+MEDIA_CORK_S = 0.015
+# Window for merging assistant transcript tokens into one transcript_delta
+TRANSCRIPT_CORK_S = 0.035
+
+# Type tags of binary media frames sent to the browser (raw payload follows)
+WS_FRAME_AUDIO = b"\x01"   # PCM16, 24kHz mono
+WS_FRAME_VIDEO = b"\x02"   # fMP4 fragment
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedConfig:
+    """Client session config, read from the raw dict once per session.
+
+    Defaults and derived flags (realtime model, voice kind) are resolved here
+    so session setup and reconnects only do attribute reads.
+    """
+
+    mode: str = "model"
+    model: str = _DEFAULT_MODEL
+    is_realtime: bool = False
+    agent_id: str = ""
+    agent_name: str = ""
+    agent_project_name: str = ""
+
+    instructions: str = ""
+    temperature: float = 0.9
+    tools: list = field(default_factory=list)
+    sr_model: str = "azure-speech"
+    recognition_language: str = "auto"
+    use_ns: bool = False
+    use_ec: bool = False
+    enable_proactive: bool = True
+
+    turn_detection_type: str = "server_vad"
+    eou_detection_type: str = "none"
+    remove_filler_words: bool = False
+
+    voice_kind: Literal["azure", "openai", "custom", "personal"] = "azure"
+    voice_name: str = _DEFAULT_VOICE
+    is_dragon_voice: bool = False
+    voice_temperature: float = 0.9
+    voice_speed: float = 1.0
+    custom_voice_name: str = ""
+    voice_deployment_id: str = ""
+    personal_voice_name: str = ""
+    personal_voice_model: str = "DragonLatestNeural"
+
+    avatar_enabled: bool = False
+    avatar_output_mode: str = "webrtc"
+    avatar_name: Optional[str] = None
+    is_photo_avatar: bool = False
+    is_custom_avatar: bool = False
+    avatar_background_image_url: str = ""
+    photo_scene: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "NormalizedConfig":
+        get = config.get
+        model = get("model", _DEFAULT_MODEL)
+        voice_type = get("voiceType", "standard")
+        voice_name = get("voiceName", _DEFAULT_VOICE)
+        if voice_type in ("custom", "personal"):
+            voice_kind = voice_type
+        else:
+            # Azure voice names are locale-prefixed ("en-US-..."); OpenAI's are not
+            voice_kind = "azure" if "-" in voice_name else "openai"
+        return cls(
+            mode=get("mode", "model"),
+            model=model,
+            is_realtime=bool(model) and "realtime" in model,
+            agent_id=get("agentId", ""),
+            agent_name=get("agentName", ""),
+            agent_project_name=get("agentProjectName", ""),
+            instructions=get("instructions", ""),
+            temperature=get("temperature", 0.9),
+            tools=get("tools", []),
+            sr_model=get("srModel", "azure-speech"),
+            recognition_language=get("recognitionLanguage", "auto"),
+            use_ns=get("useNS", False),
+            use_ec=get("useEC", False),
+            enable_proactive=get("enableProactive", True),
+            turn_detection_type=get("turnDetectionType", "server_vad"),
+            eou_detection_type=get("eouDetectionType", "none"),
+            remove_filler_words=get("removeFillerWords", False),
+            voice_kind=voice_kind,
+            voice_name=voice_name,
+            is_dragon_voice="Dragon" in voice_name,
+            voice_temperature=get("voiceTemperature", 0.9),
+            voice_speed=get("voiceSpeed", 1.0),
+            custom_voice_name=get("customVoiceName", ""),
+            voice_deployment_id=get("voiceDeploymentId", ""),
+            personal_voice_name=get("personalVoiceName", ""),
+            personal_voice_model=get("personalVoiceModel", "DragonLatestNeural"),
+            avatar_enabled=get("avatarEnabled", False),
+            avatar_output_mode=get("avatarOutputMode", "webrtc"),
+            avatar_name=get("avatarName"),
+            is_photo_avatar=get("isPhotoAvatar", False),
+            is_custom_avatar=get("isCustomAvatar", False),
+            avatar_background_image_url=get("avatarBackgroundImageUrl", ""),
+            photo_scene=get("photoScene", {}),
+        )
+
 
 class VoiceSessionHandler:
     """
     Manages a single Voice Live session with avatar support.
     Acts as a bridge between the browser WebSocket and Azure Voice Live API.
+    send_message accepts a message dict, or bytes sent verbatim as a binary
+    frame (pre-serialized JSON, or a tagged audio/video frame).
     """
 
+    # One instance per live call; slots drop the per-instance __dict__
+    __slots__ = (
+        "client_id", "endpoint", "credential", "send_message", "config", "ncfg",
+        "connection", "is_running", "_event_task", "_pending_proactive",
+        "_waiters", "_function_tasks",
+        "_audio_cork_buf", "_audio_cork_task", "_video_cork_buf", "_video_cork_task",
+        "_transcript_buf", "_transcript_task",
+        "_audio_chunk_count", "_video_sent_count",
+        "_dispatch", "_scene_update_prefix",
+    )
+
     def __init__(
         self,
         client_id: str,
@@ -59,30 +270,65 @@ class VoiceSessionHandler:
         self.credential = credential
         self.send_message = send_message
         self.config = config
+        self.ncfg = NormalizedConfig.from_dict(config)
 
         self.connection = None
         self.is_running = False
         self._event_task: Optional[asyncio.Task] = None
         self._pending_proactive = False
 
+        # Futures fulfilled by _process_events, keyed by server event type
+        self._waiters: Dict[str, List[asyncio.Future]] = defaultdict(list)
+        self._function_tasks: Set[asyncio.Task] = set()
+
+        # Corked media and transcript deltas waiting for the next flush
+        self._audio_cork_buf = bytearray()
+        self._audio_cork_task: Optional[asyncio.Task] = None
+        self._video_cork_buf = bytearray()
+        self._video_cork_task: Optional[asyncio.Task] = None
+        self._transcript_buf: List[str] = []
+        self._transcript_task: Optional[asyncio.Task] = None
+
+        # Sampled-logging counters for the audio/video hot paths
+        self._audio_chunk_count = 0
+        self._video_sent_count = 0
+
+        # Pre-encoded static part of the scene session.update, built on first use
+        self._scene_update_prefix: Optional[bytes] = None
+
+        # Server event type -> bound handler, used by _handle_event
+        self._dispatch = {
+            ServerEventType.RESPONSE_AUDIO_DELTA: self._on_audio_delta,
+            ServerEventType.RESPONSE_AUDIO_DONE: self._on_audio_done,
+            ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA: self._on_transcript_delta,
+            ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DONE: self._on_transcript_done,
+            ServerEventType.RESPONSE_TEXT_DELTA: self._on_text_delta,
+            ServerEventType.RESPONSE_TEXT_DONE: self._on_text_done,
+            ServerEventType.RESPONSE_CREATED: self._on_response_created,
+            ServerEventType.RESPONSE_DONE: self._on_response_done,
+            ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STARTED: self._on_speech_started,
+            ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STOPPED: self._on_speech_stopped,
+            ServerEventType.CONVERSATION_ITEM_INPUT_AUDIO_TRANSCRIPTION_COMPLETED: self._on_input_transcription_completed,
+            ServerEventType.SESSION_AVATAR_CONNECTING: self._on_avatar_connecting,
+            ServerEventType.CONVERSATION_ITEM_CREATED: self._handle_conversation_item,
+            ServerEventType.ERROR: self._on_error,
+            ServerEventType.SESSION_UPDATED: self._on_session_updated,
+            "response.video.delta": self._on_video_delta,
+        }
+
     async def start(self):
         """Start the Voice Live session."""
         try:
             self.is_running = True
-            model = self.config.get("model", os.getenv("VOICELIVE_MODEL", "gpt-4o-realtime"))
-            mode = self.config.get("mode", "model")
+            ncfg = self.ncfg
 
             # Build connection model string based on mode
-            if mode == "agent":
-                agent_id = self.config.get("agentId", "")
-                project_name = self.config.get("agentProjectName", "")
-                session_model = f"agent?aid={agent_id}&apn={project_name}"
-            elif mode == "agent-v2":
-                agent_name = self.config.get("agentName", "")
-                project_name = self.config.get("agentProjectName", "")
-                session_model = f"agent?aname={agent_name}&apn={project_name}"
+            if ncfg.mode == "agent":
+                session_model = f"agent?aid={ncfg.agent_id}&apn={ncfg.agent_project_name}"
+            elif ncfg.mode == "agent-v2":
+                session_model = f"agent?aname={ncfg.agent_name}&apn={ncfg.agent_project_name}"
             else:
-                session_model = model
+                session_model = ncfg.model
 
             logger.info(f"Connecting to Voice Live with model: {session_model}")
 
@@ -93,11 +339,14 @@ class VoiceSessionHandler:
             ) as connection:
                 self.connection = connection
 
-                # Configure session
-                await self._setup_session(connection)
-
-                # Process events
-                await self._process_events(connection)
+                # _process_events is the only reader of the connection;
+                # session setup waits on it for SESSION_UPDATED
+                self._event_task = asyncio.create_task(self._process_events(connection))
+                try:
+                    await self._setup_session(connection)
+                    await self._event_task
+                finally:
+                    self._event_task.cancel()
 
         except asyncio.CancelledError:
             logger.info(f"Session cancelled for client {self.client_id}")
@@ -113,45 +362,41 @@ class VoiceSessionHandler:
 
     async def _setup_session(self, connection):
         """Configure the Voice Live session with avatar, voice, and other settings."""
-        config = self.config
-        mode = config.get("mode", "model")
-        model = config.get("model", "gpt-4o-realtime")
+        ncfg = self.ncfg
 
         # Build voice configuration
-        voice_config = self._build_voice_config(config)
+        voice_config = self._build_voice_config(ncfg)
 
         # Build avatar configuration
-        avatar_config = self._build_avatar_config(config)
+        avatar_config = self._build_avatar_config(ncfg)
 
         # Build turn detection
-        turn_detection = self._build_turn_detection(config)
+        turn_detection = self._build_turn_detection(ncfg)
 
         # Build modalities (avatar is NOT a modality - it's configured via the avatar field)
         modalities = [Modality.TEXT, Modality.AUDIO]
 
         # Build SR options
-        sr_model = config.get("srModel", "azure-speech")
-        recognition_language = config.get("recognitionLanguage", "auto")
-        is_realtime = model and "realtime" in model
+        sr_model = ncfg.sr_model
+        recognition_language = ncfg.recognition_language
         input_audio_transcription = AudioInputTranscriptionOptions(
-            model="whisper-1" if (mode == "model" and is_realtime) else sr_model,
+            model="whisper-1" if (ncfg.mode == "model" and ncfg.is_realtime) else sr_model,
             language=None if (sr_model == "mai-ears-1" or recognition_language == "auto")
             else recognition_language,
         )
 
         # Build tools list
-        tools = config.get("tools", [])
+        tools = ncfg.tools
 
         # Build noise/echo settings
         noise_reduction = None
         echo_cancellation = None
-        if config.get("useNS", False):
-            noise_reduction = {"type": "azure_deep_noise_suppression"}
-        if config.get("useEC", False):
-            echo_cancellation = {"type": "server_echo_cancellation"}
+        if ncfg.use_ns:
+            noise_reduction = _NOISE_REDUCTION
+        if ncfg.use_ec:
+            echo_cancellation = _ECHO_CANCELLATION
 
-        instructions = config.get("instructions", "")
-        temperature = config.get("temperature", 0.9)
+        instructions = ncfg.instructions
 
         session_config = RequestSession(
             modalities=modalities,
@@ -164,46 +409,43 @@ class VoiceSessionHandler:
             turn_detection=turn_detection,
             tools=tools if tools else None,
             tool_choice=ToolChoiceLiteral.AUTO if tools else None,
-            temperature=temperature if mode != "agent-v2" else None,
+            temperature=ncfg.temperature if ncfg.mode != "agent-v2" else None,
             input_audio_noise_reduction=noise_reduction,
             input_audio_echo_cancellation=echo_cancellation,
         )
 
+        # Register before sending so a fast reply cannot be missed
+        updated_waiter = self._expect_event(_WAIT_SESSION_UPDATED)
         logger.info(f"[SEND] session.update: {session_config}")
         await connection.session.update(session=session_config)
 
         # Wait for SESSION_UPDATED
-        session_updated = await self._wait_for_event(
-            connection, {ServerEventType.SESSION_UPDATED}
-        )
-        if session_updated is None:
-            raise ValueError("SESSION_UPDATED event not received")
+        session_updated = await self._wait_for_event(_WAIT_SESSION_UPDATED, waiter=updated_waiter)
 
         logger.info(f"Session configured for client {self.client_id}")
 
-        avatar_output_mode = config.get("avatarOutputMode", "webrtc")
+        avatar_output_mode = ncfg.avatar_output_mode
 
         # If avatar is enabled with WebRTC mode, relay ICE servers info to browser
-        if config.get("avatarEnabled", False) and avatar_output_mode == "webrtc":
-            if hasattr(session_updated, "session") and session_updated.session:
-                session_data = session_updated.session
-                if hasattr(session_data, "avatar") and session_data.avatar:
-                    avatar_data = session_data.avatar
-                    if hasattr(avatar_data, "ice_servers") and avatar_data.ice_servers:
-                        ice_servers = []
-                        for server in avatar_data.ice_servers:
-                            ice_server = {"urls": server.urls}
-                            if server.username:
-                                ice_server["username"] = server.username
-                            if server.credential:
-                                ice_server["credential"] = server.credential
-                            ice_servers.append(ice_server)
-
-                        await self.send_message({
-                            "type": "ice_servers",
-                            "iceServers": ice_servers,
-                        })
-                        logger.info(f"Sent ICE servers to client {self.client_id}")
+        if ncfg.avatar_enabled and avatar_output_mode == "webrtc":
+            try:
+                ice = session_updated.session.avatar.ice_servers
+            except AttributeError:
+                ice = None
+            if ice:
+                ice_servers = [
+                    {
+                        "urls": server.urls,
+                        **({"username": server.username} if server.username else {}),
+                        **({"credential": server.credential} if server.credential else {}),
+                    }
+                    for server in ice
+                ]
+                await self.send_message({
+                    "type": "ice_servers",
+                    "iceServers": ice_servers,
+                })
+                logger.info(f"Sent ICE servers to client {self.client_id}")
 
         # Extract session ID if available
         session_id = None
@@ -217,8 +459,8 @@ class VoiceSessionHandler:
             "status": "success",
             "sessionId": session_id,
             "config": {
-                "model": model,
-                "avatarEnabled": config.get("avatarEnabled", False),
+                "model": ncfg.model,
+                "avatarEnabled": ncfg.avatar_enabled,
                 "avatarOutputMode": avatar_output_mode,
             },
         })
@@ -227,8 +469,8 @@ class VoiceSessionHandler:
         # - No avatar: send immediately
         # - Avatar + websocket: send immediately (no WebRTC handshake needed)
         # - Avatar + webrtc: defer until SESSION_AVATAR_CONNECTING event
-        if not config.get("avatarEnabled", False):
-            if config.get("enableProactive", True):
+        if not ncfg.avatar_enabled:
+            if ncfg.enable_proactive:
                 try:
                     logger.info("[SEND] response.create (proactive greeting, no avatar)")
                     await connection.response.create()
@@ -237,7 +479,7 @@ class VoiceSessionHandler:
                     logger.error(f"Failed to send proactive greeting: {e}")
         elif avatar_output_mode == "websocket":
             # WebSocket avatar mode: no WebRTC handshake, send greeting immediately
-            if config.get("enableProactive", True):
+            if ncfg.enable_proactive:
                 try:
                     logger.info("[SEND] response.create (proactive greeting, websocket avatar)")
                     await connection.response.create()
@@ -246,61 +488,48 @@ class VoiceSessionHandler:
                     logger.error(f"Failed to send proactive greeting: {e}")
         else:
             # WebRTC avatar: defer proactive greeting until avatar connect
-            self._pending_proactive = config.get("enableProactive", True)
+            self._pending_proactive = ncfg.enable_proactive
 
-    def _build_voice_config(self, config: dict):
+    def _build_voice_config(self, ncfg: NormalizedConfig):
         """Build voice configuration from client settings."""
-        voice_type = config.get("voiceType", "standard")
-        voice_name = config.get("voiceName", os.getenv("VOICELIVE_VOICE", "en-US-AvaMultilingualNeural"))
-        voice_temperature = config.get("voiceTemperature", 0.9)
-        voice_speed = config.get("voiceSpeed", 1.0)
-
-        if voice_type == "custom":
-            custom_voice_name = config.get("customVoiceName", "")
-            deployment_id = config.get("voiceDeploymentId", "")
+        voice_kind = ncfg.voice_kind
+        if voice_kind == "custom":
             return AzureCustomVoice(
-                name=custom_voice_name,
-                endpoint_id=deployment_id,
-                rate=str(voice_speed),
+                name=ncfg.custom_voice_name,
+                endpoint_id=ncfg.voice_deployment_id,
+                rate=_rate_str(ncfg.voice_speed),
             )
-        elif voice_type == "personal":
-            personal_voice_name = config.get("personalVoiceName", "")
-            personal_model = config.get("personalVoiceModel", "DragonLatestNeural")
+        elif voice_kind == "personal":
             return AzurePersonalVoice(
-                name=personal_voice_name,
-                model=personal_model,
-                temperature=voice_temperature,
+                name=ncfg.personal_voice_name,
+                model=ncfg.personal_voice_model,
+                temperature=ncfg.voice_temperature,
+            )
+        elif voice_kind == "azure":
+            return AzureStandardVoice(
+                name=ncfg.voice_name,
+                temperature=ncfg.voice_temperature if ncfg.is_dragon_voice else None,
+                rate=_rate_str(ncfg.voice_speed),
             )
         else:
-            # Standard voice - check if Azure or OpenAI
-            if "-" in voice_name:
-                # Azure voice
-                is_dragon = "Dragon" in voice_name
-                return AzureStandardVoice(
-                    name=voice_name,
-                    temperature=voice_temperature if is_dragon else None,
-                    rate=str(voice_speed),
-                )
-            else:
-                # OpenAI voice
-                return OpenAIVoice(name=voice_name)
+            return OpenAIVoice(name=ncfg.voice_name)
 
-    def _build_avatar_config(self, config: dict) -> Optional[AvatarConfig]:
+    def _build_avatar_config(self, ncfg: NormalizedConfig) -> Optional[AvatarConfig]:
         """Build avatar configuration from client settings."""
-        if not config.get("avatarEnabled", False):
+        if not ncfg.avatar_enabled:
             return None
 
-        avatar_name = config.get("avatarName", "Lisa-casual-sitting")
-        is_photo = config.get("isPhotoAvatar", False)
-        is_custom = config.get("isCustomAvatar", False)
-        background_url = config.get("avatarBackgroundImageUrl", "")
+        avatar_name = ncfg.avatar_name or "Lisa-casual-sitting"
+        is_photo = ncfg.is_photo_avatar
+        is_custom = ncfg.is_custom_avatar
+        background_url = ncfg.avatar_background_image_url
 
         # Parse character and style from avatar name
         if is_custom:
             character = avatar_name
             style = None
         elif is_photo:
-            photo_name = config.get("avatarName", "Anika")
+            photo_name = ncfg.avatar_name or "Anika"
             parts = photo_name.split("-", 1)
             character = parts[0].lower() if parts else photo_name.lower()
             style = parts[1] if len(parts) > 1 else None
@@ -346,21 +575,21 @@ class VoiceSessionHandler:
         if is_photo:
             avatar_cfg["type"] = "photo-avatar"
             avatar_cfg["model"] = "vasa-1"
-            photo_scene = config.get("photoScene", {})
+            photo_scene = ncfg.photo_scene
             if photo_scene:
-                import math
+                scene_get = photo_scene.get
                 avatar_cfg["scene"] = {
-                    "zoom": photo_scene.get("zoom", 100) / 100,
-                    "position_x": photo_scene.get("positionX", 0) / 100,
-                    "position_y": photo_scene.get("positionY", 0) / 100,
-                    "rotation_x": photo_scene.get("rotationX", 0) * math.pi / 180,
-                    "rotation_y": photo_scene.get("rotationY", 0) * math.pi / 180,
-                    "rotation_z": photo_scene.get("rotationZ", 0) * math.pi / 180,
-                    "amplitude": photo_scene.get("amplitude", 100) / 100,
+                    "zoom": scene_get("zoom", 100) * _INV_100,
+                    "position_x": scene_get("positionX", 0) * _INV_100,
+                    "position_y": scene_get("positionY", 0) * _INV_100,
+                    "rotation_x": scene_get("rotationX", 0) * _DEG2RAD,
+                    "rotation_y": scene_get("rotationY", 0) * _DEG2RAD,
+                    "rotation_z": scene_get("rotationZ", 0) * _DEG2RAD,
+                    "amplitude": scene_get("amplitude", 100) * _INV_100,
                 }
 
         # Add output_protocol (not in SDK model, inject as additional property)
-        avatar_output_mode = config.get("avatarOutputMode", "webrtc")
+        avatar_output_mode = ncfg.avatar_output_mode
         try:
             avatar_cfg["output_protocol"] = avatar_output_mode
         except Exception:
@@ -371,41 +600,44 @@ class VoiceSessionHandler:
 
         return avatar_cfg
 
-    def _build_turn_detection(self, config: dict):
+    def _build_turn_detection(self, ncfg: NormalizedConfig):
         """Build turn detection configuration."""
-        td_type = config.get("turnDetectionType", "server_vad")
-        eou_type = config.get("eouDetectionType", "none")
-        remove_filler = config.get("removeFillerWords", False)
-
-        if td_type == "azure_semantic_vad":
-            eou_detection = None
-            if eou_type == "semantic_detection_v1":
-                eou_detection = AzureSemanticDetection(
-                    threshold_level="default",
-                    timeout_ms=1000,
-                )
+        if ncfg.turn_detection_type == "azure_semantic_vad":
+            eou_detection = (
+                _SEMANTIC_EOU_DETECTION if ncfg.eou_detection_type == "semantic_detection_v1" else None
+            )
             return AzureSemanticVad(
                 threshold=0.3,
                 prefix_padding_ms=300,
                 speech_duration_ms=80,
                 silence_duration_ms=500,
-                remove_filler_words=remove_filler,
+                remove_filler_words=ncfg.remove_filler_words,
                 interrupt_response=True,
                 end_of_utterance_detection=eou_detection,
             )
         else:
-            return ServerVad(
-                threshold=0.3,
-                prefix_padding_ms=300,
-                silence_duration_ms=500,
-            )
+            return _DEFAULT_SERVER_VAD
 
     async def _process_events(self, connection):
         """Process incoming events from Voice Live API.
         
         Uses manual recv() loop instead of 'async for' so that individual
         event parsing/handling errors don't kill the entire event loop.
+        This is the single consumer of the connection: coroutines waiting
+        in _wait_for_event are resolved here before the event is dispatched.
         """
+        try:
+            await self._receive_loop(connection)
+        finally:
+            # Nothing else will arrive; fail anyone still waiting so their
+            # usual error handling (session_error, function_call_error) runs
+            for waiters in self._waiters.values():
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(ConnectionError("Voice Live connection closed"))
+            self._waiters.clear()
+
+    async def _receive_loop(self, connection):
         while self.is_running:
             try:
                 event = await connection.recv()
@@ -422,15 +654,17 @@ class VoiceSessionHandler:
 
             try:
                 etype = getattr(event, 'type', 'unknown')
-                if etype not in (ServerEventType.RESPONSE_AUDIO_DELTA,
-                                 ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA,
-                                 "response.video.delta"):
-                    logger.info(f"[RECV] {etype}: {event}")
-                if etype == "response.video.delta":
-                    self._video_chunk_count = getattr(self, '_video_chunk_count', 0) + 1
-                    if self._video_chunk_count <= 5 or self._video_chunk_count % 100 == 0:
-                        delta_len = len(event.get('delta', '')) if hasattr(event, 'get') else 0
-                        logger.info(f"[RECV] response.video.delta #{self._video_chunk_count}, delta_len={delta_len}")
+                if etype not in _HIGH_RATE_EVENTS and logger.isEnabledFor(logging.DEBUG):
+                    if _DEBUG_VERBOSE:
+                        logger.debug("[RECV] %s: %s", etype, event)
+                    else:
+                        logger.debug("[RECV] %s", etype)
+                if self._waiters:
+                    waiters = self._waiters.pop(etype, None)
+                    if waiters:
+                        for waiter in waiters:
+                            if not waiter.done():
+                                waiter.set_result(event)
                 await self._handle_event(event, connection)
             except asyncio.CancelledError:
                 raise
@@ -443,147 +677,205 @@ class VoiceSessionHandler:
         try:
             event_type = event.type
 
-            # Audio delta - relay to browser
-            if event_type == ServerEventType.RESPONSE_AUDIO_DELTA:
-                if hasattr(event, "delta") and event.delta:
-                    audio_b64 = base64.b64encode(event.delta).decode("utf-8")
-                    await self.send_message({
-                        "type": "audio_data",
-                        "data": audio_b64,
-                        "format": "pcm16",
-                        "sampleRate": 24000,
-                    })
-
-            elif event_type == ServerEventType.RESPONSE_AUDIO_DONE:
-                await self.send_message({"type": "audio_done"})
-
-            # Audio transcript (assistant speaking text)
-            elif event_type == ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DELTA:
-                if hasattr(event, "delta") and event.delta:
-                    await self.send_message({
-                        "type": "transcript_delta",
-                        "role": "assistant",
-                        "delta": event.delta,
-                    })
-
-            elif event_type == ServerEventType.RESPONSE_AUDIO_TRANSCRIPT_DONE:
-                transcript = getattr(event, "transcript", "")
-                await self.send_message({
-                    "type": "transcript_done",
-                    "role": "assistant",
-                    "transcript": transcript,
-                })
+            # Keep ordering: corked deltas go out before any other event
+            if event_type not in _HIGH_RATE_EVENTS:
+                await self._flush_corked()
 
-            # Text delta (for text responses)
-            elif event_type == ServerEventType.RESPONSE_TEXT_DELTA:
-                if hasattr(event, "delta") and event.delta:
-                    await self.send_message({
-                        "type": "text_delta",
-                        "delta": event.delta,
-                    })
+            handler = self._dispatch.get(event_type)
+            if handler is not None:
+                await handler(event, connection)
 
-            elif event_type == ServerEventType.RESPONSE_TEXT_DONE:
-                text = getattr(event, "text", "")
-                await self.send_message({
-                    "type": "text_done",
-                    "text": text,
-                })
+        except Exception as e:
+            logger.error(f"Error handling event {getattr(event, 'type', 'unknown')}: {e}")
 
-            # Response lifecycle
-            elif event_type == ServerEventType.RESPONSE_CREATED:
-                response_id = getattr(event, "response", None)
-                rid = response_id.id if response_id and hasattr(response_id, "id") else ""
-                await self.send_message({
-                    "type": "response_created",
-                    "responseId": rid,
-                })
+    # Audio delta - cork and relay to browser
+    async def _on_audio_delta(self, event, connection):
+        delta = getattr(event, "delta", None)
+        if delta:
+            self._audio_cork_buf += delta
+            if self._audio_cork_task is None:
+                self._audio_cork_task = asyncio.create_task(self._flush_audio_cork_later())
+
+    async def _on_audio_done(self, event, connection):
+        await self.send_message({"type": "audio_done"})
+
+    # Audio transcript (assistant speaking text)
+    async def _on_transcript_delta(self, event, connection):
+        delta = getattr(event, "delta", None)
+        if delta:
+            self._transcript_buf.append(delta)
+            if self._transcript_task is None:
+                self._transcript_task = asyncio.create_task(self._flush_transcript_later())
+
+    async def _on_transcript_done(self, event, connection):
+        await self.send_message({
+            "type": "transcript_done",
+            "role": "assistant",
+            "transcript": getattr(event, "transcript", ""),
+        })
 
-            elif event_type == ServerEventType.RESPONSE_DONE:
-                await self.send_message({"type": "response_done"})
+    # Text delta (for text responses)
+    async def _on_text_delta(self, event, connection):
+        delta = getattr(event, "delta", None)
+        if delta:
+            await self.send_message({
+                "type": "text_delta",
+                "delta": delta,
+            })
 
-            # Speech detection
-            elif event_type == ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STARTED:
-                item_id = getattr(event, "item_id", "") or getattr(event, "itemId", "")
-                await self.send_message({
-                    "type": "speech_started",
-                    "itemId": item_id,
-                })
+    async def _on_text_done(self, event, connection):
+        await self.send_message({
+            "type": "text_done",
+            "text": getattr(event, "text", ""),
+        })
 
-            elif event_type == ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STOPPED:
-                await self.send_message({
-                    "type": "speech_stopped",
-                })
+    # Response lifecycle
+    async def _on_response_created(self, event, connection):
+        response = getattr(event, "response", None)
+        await self.send_message({
+            "type": "response_created",
+            "responseId": getattr(response, "id", "") if response else "",
+        })
 
-            # User transcription
-            elif event_type == ServerEventType.CONVERSATION_ITEM_INPUT_AUDIO_TRANSCRIPTION_COMPLETED:
-                transcript = getattr(event, "transcript", "")
-                item_id = getattr(event, "item_id", "") or getattr(event, "itemId", "")
-                if transcript:
-                    await self.send_message({
-                        "type": "transcript_done",
-                        "role": "user",
-                        "transcript": transcript,
-                        "itemId": item_id,
-                    })
-
-            # Avatar WebRTC signaling
-            elif event_type == ServerEventType.SESSION_AVATAR_CONNECTING:
-                server_sdp = getattr(event, "server_sdp", "")
-                if server_sdp:
-                    await self.send_message({
-                        "type": "avatar_sdp_answer",
-                        "serverSdp": server_sdp,
-                    })
-                    logger.info("Relayed avatar SDP answer to browser")
-
-                    # Avatar connection succeeded — now send proactive greeting if pending
-                    if getattr(self, "_pending_proactive", False):
-                        self._pending_proactive = False
-                        try:
-                            logger.info("[SEND] response.create (proactive greeting, after avatar connect)")
-                            await connection.response.create()
-                            logger.info("Proactive greeting sent after avatar connect")
-                        except Exception as e:
-                            logger.error(f"Failed to send proactive greeting: {e}")
-
-            # Function calls
-            elif event_type == ServerEventType.CONVERSATION_ITEM_CREATED:
-                await self._handle_conversation_item(event, connection)
-
-            # Errors
-            elif event_type == ServerEventType.ERROR:
-                error_msg = str(event)
-                logger.error(f"Voice Live error: {error_msg}")
-                await self.send_message({
-                    "type": "error",
-                    "error": error_msg,
-                })
+    async def _on_response_done(self, event, connection):
+        await self.send_message({"type": "response_done"})
 
-            # Session updated (may contain additional info)
-            elif event_type == ServerEventType.SESSION_UPDATED:
-                # Log the session state so we can diagnose config resets
-                if hasattr(event, 'session') and event.session:
-                    s = event.session
-                    logger.info(f"[SESSION_UPDATED] input_audio_format={getattr(s, 'input_audio_format', '?')}, "
-                                f"output_audio_format={getattr(s, 'output_audio_format', '?')}, "
-                                f"turn_detection type={getattr(getattr(s, 'turn_detection', None), 'type', '?')}, "
-                                f"avatar={getattr(s, 'avatar', '?')}")
-
-            # Avatar video via WebSocket mode (response.video.delta)
-            # SDK parses this as a generic ServerEvent with string type
-            elif event_type == "response.video.delta":
-                delta = event.get("delta", "")
-                if delta:
-                    self._video_sent_count = getattr(self, '_video_sent_count', 0) + 1
-                    if self._video_sent_count <= 5 or self._video_sent_count % 100 == 0:
-                        logger.info(f"[SEND] video_data #{self._video_sent_count}, delta_len={len(delta)}")
-                    await self.send_message({
-                        "type": "video_data",
-                        "delta": delta,
-                    })
+    # Speech detection
+    async def _on_speech_started(self, event, connection):
+        item_id = getattr(event, "item_id", "") or getattr(event, "itemId", "")
+        await self.send_message({
+            "type": "speech_started",
+            "itemId": item_id,
+        })
 
-        except Exception as e:
-            logger.error(f"Error handling event {getattr(event, 'type', 'unknown')}: {e}")
+    async def _on_speech_stopped(self, event, connection):
+        await self.send_message({
+            "type": "speech_stopped",
+        })
+
+    # User transcription
+    async def _on_input_transcription_completed(self, event, connection):
+        transcript = getattr(event, "transcript", "")
+        item_id = getattr(event, "item_id", "") or getattr(event, "itemId", "")
+        if transcript:
+            await self.send_message({
+                "type": "transcript_done",
+                "role": "user",
+                "transcript": transcript,
+                "itemId": item_id,
+            })
+
+    # Avatar WebRTC signaling
+    async def _on_avatar_connecting(self, event, connection):
+        server_sdp = getattr(event, "server_sdp", "")
+        if not server_sdp:
+            return
+        await self.send_message({
+            "type": "avatar_sdp_answer",
+            "serverSdp": server_sdp,
+        })
+        logger.info("Relayed avatar SDP answer to browser")
+
+        # Avatar connection succeeded — now send proactive greeting if pending
+        if self._pending_proactive:
+            self._pending_proactive = False
+            try:
+                logger.info("[SEND] response.create (proactive greeting, after avatar connect)")
+                await connection.response.create()
+                logger.info("Proactive greeting sent after avatar connect")
+            except Exception as e:
+                logger.error(f"Failed to send proactive greeting: {e}")
+
+    # Errors
+    async def _on_error(self, event, connection):
+        error_msg = str(event)
+        logger.error(f"Voice Live error: {error_msg}")
+        await self.send_message({
+            "type": "error",
+            "error": error_msg,
+        })
+
+    # Session updated (may contain additional info)
+    async def _on_session_updated(self, event, connection):
+        # Log the session state so we can diagnose config resets
+        s = getattr(event, "session", None)
+        if s:
+            logger.info(f"[SESSION_UPDATED] input_audio_format={getattr(s, 'input_audio_format', '?')}, "
+                        f"output_audio_format={getattr(s, 'output_audio_format', '?')}, "
+                        f"turn_detection type={getattr(getattr(s, 'turn_detection', None), 'type', '?')}, "
+                        f"avatar={getattr(s, 'avatar', '?')}")
+
+    # Avatar video via WebSocket mode (response.video.delta)
+    # SDK parses this as a generic ServerEvent with string type
+    async def _on_video_delta(self, event, connection):
+        delta = event.get("delta", "")
+        if not delta:
+            return
+        self._video_sent_count += 1
+        count = self._video_sent_count
+        if (count <= 5 or count % 100 == 0) and logger.isEnabledFor(logging.INFO):
+            logger.info("[SEND] video_data #%d, delta_len=%d", count, len(delta))
+        self._video_cork_buf += binascii.a2b_base64(delta)
+        if self._video_cork_task is None:
+            self._video_cork_task = asyncio.create_task(self._flush_video_cork_later())
+
+    async def _flush_audio_cork_later(self):
+        """Flush corked audio once the cork window elapses."""
+        await asyncio.sleep(MEDIA_CORK_S)
+        self._audio_cork_task = None
+        await self._flush_audio_cork()
+
+    async def _flush_video_cork_later(self):
+        """Flush corked video once the cork window elapses."""
+        await asyncio.sleep(MEDIA_CORK_S)
+        self._video_cork_task = None
+        await self._flush_video_cork()
+
+    async def _flush_transcript_later(self):
+        """Flush buffered transcript tokens once the cork window elapses."""
+        await asyncio.sleep(TRANSCRIPT_CORK_S)
+        self._transcript_task = None
+        await self._flush_transcript()
+
+    async def _flush_audio_cork(self):
+        """Send all corked audio bytes as a single binary audio frame."""
+        if not self._audio_cork_buf:
+            return
+        frame = WS_FRAME_AUDIO + self._audio_cork_buf
+        self._audio_cork_buf.clear()
+        await self.send_message(frame)
+
+    async def _flush_video_cork(self):
+        """Send all corked video bytes as a single binary video frame."""
+        if not self._video_cork_buf:
+            return
+        frame = WS_FRAME_VIDEO + self._video_cork_buf
+        self._video_cork_buf.clear()
+        await self.send_message(frame)
+
+    async def _flush_transcript(self):
+        """Send buffered transcript tokens as a single transcript_delta."""
+        if not self._transcript_buf:
+            return
+        delta = "".join(self._transcript_buf)
+        self._transcript_buf.clear()
+        await self.send_message({
+            "type": "transcript_delta",
+            "role": "assistant",
+            "delta": delta,
+        })
+
+    async def _flush_corked(self):
+        """Flush corked audio/video/transcript now, cancelling pending timers."""
+        for task in (self._audio_cork_task, self._video_cork_task, self._transcript_task):
+            if task is not None:
+                task.cancel()
+        self._audio_cork_task = None
+        self._video_cork_task = None
+        self._transcript_task = None
+        await self._flush_audio_cork()
+        await self._flush_video_cork()
+        await self._flush_transcript()
 
     async def _handle_conversation_item(self, event, connection):
         """Handle function call events."""
@@ -605,11 +897,22 @@ class VoiceSessionHandler:
             "callId": call_id,
         })
 
+        # Register before returning to the receive loop so neither event can
+        # slip past; the call itself runs as a task since it waits on that loop
+        args_waiter = self._expect_event(_WAIT_FUNCTION_ARGS_DONE)
+        done_waiter = self._expect_event(_WAIT_RESPONSE_DONE)
+        task = asyncio.create_task(self._run_function_call(
+            function_name, call_id, previous_item_id, args_waiter, done_waiter, connection
+        ))
+        self._function_tasks.add(task)
+        task.add_done_callback(self._function_tasks.discard)
+
+    async def _run_function_call(self, function_name, call_id, previous_item_id,
+                                 args_waiter, done_waiter, connection):
+        """Wait for a function call's arguments, execute it and reply."""
         try:
             # Wait for arguments
-            args_done = await self._wait_for_event(
-                connection, {ServerEventType.RESPONSE_FUNCTION_CALL_ARGUMENTS_DONE}
-            )
+            args_done = await self._wait_for_event(_WAIT_FUNCTION_ARGS_DONE, waiter=args_waiter)
             if args_done.call_id != call_id:
                 logger.warning(f"Call ID mismatch: expected {call_id}, got {args_done.call_id}")
                 return
@@ -618,7 +921,7 @@ class VoiceSessionHandler:
             logger.info(f"Function args: {arguments}")
 
             # Wait for response done
-            await self._wait_for_event(connection, {ServerEventType.RESPONSE_DONE})
+            await self._wait_for_event(_WAIT_RESPONSE_DONE, waiter=done_waiter)
 
             # Execute built-in functions
             result = await self._execute_function(function_name, arguments)
@@ -630,10 +933,15 @@ class VoiceSessionHandler:
                 "result": result,
             })
 
-            # Send result back
-            function_output = FunctionCallOutputItem(
-                call_id=call_id, output=json.dumps(result)
-            )
+            # Send result back; large tool results are serialized in a worker
+            # thread so the receive loop keeps relaying audio meanwhile
+            if _is_large_result(result):
+                payload = await asyncio.get_running_loop().run_in_executor(
+                    None, orjson.dumps, result
+                )
+            else:
+                payload = orjson.dumps(result)
+            function_output = FunctionCallOutputItem(call_id=call_id, output=payload.decode())
             await connection.conversation.item.create(
                 previous_item_id=previous_item_id, item=function_output
             )
@@ -647,46 +955,64 @@ class VoiceSessionHandler:
                 "callId": call_id,
                 "error": str(e),
             })
+        finally:
+            self._discard_waiter(args_waiter, _WAIT_FUNCTION_ARGS_DONE)
+            self._discard_waiter(done_waiter, _WAIT_RESPONSE_DONE)
 
     async def _execute_function(self, name: str, arguments: str) -> dict:
         """Execute a built-in function and return result."""
         try:
-            args = json.loads(arguments) if arguments else {}
-        except json.JSONDecodeError:
+            args = orjson.loads(arguments) if arguments else {}
+        except orjson.JSONDecodeError:
             args = {}
 
         if name == "get_time":
-            from datetime import datetime
-            return {"time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+            return {"time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())}
         elif name == "get_weather":
             location = args.get("location", "unknown")
             return {"location": location, "temperature": "72°F", "condition": "Sunny"}
         elif name == "calculate":
             expression = args.get("expression", "")
             try:
-                result = eval(expression, {"__builtins__": {}})
+                result = _safe_eval(_parse_expression(expression))
                 return {"expression": expression, "result": str(result)}
             except Exception:
                 return {"expression": expression, "error": "Could not evaluate"}
         else:
             return {"error": f"Unknown function: {name}"}
 
-    _audio_chunk_count = 0
-
-    async def send_audio(self, audio_base64: str):
-        """Send audio data from browser to Voice Live."""
+    def _can_send_audio(self) -> bool:
+        """Check the connection before forwarding audio, logging drops."""
         if not self.connection:
             self._audio_chunk_count += 1
             if self._audio_chunk_count == 1 or self._audio_chunk_count % 500 == 0:
                 logger.warning(f"[AUDIO] No connection — dropping audio chunk #{self._audio_chunk_count} (connection lost)")
-            return
+            return False
         if not self.is_running:
             logger.warning(f"[AUDIO] Session not running — dropping audio chunk")
-            return
+            return False
+        return True
+
+    async def send_audio_bytes(self, audio: Union[bytes, memoryview]):
+        """Send raw PCM16 audio received as a binary WebSocket frame.
+
+        The Voice Live wire protocol carries audio as base64 inside JSON, so
+        the bytes are encoded exactly once here, and only for frames that
+        will actually be forwarded.
+        """
+        if self._can_send_audio():
+            await self._append_audio(b64encode_as_string(audio))
+
+    async def send_audio(self, audio_base64: str):
+        """Send base64 audio data from browser to Voice Live."""
+        if self._can_send_audio():
+            await self._append_audio(audio_base64)
+
+    async def _append_audio(self, audio_base64: str):
         try:
-            self._audio_chunk_count += 1
-            if self._audio_chunk_count <= 3 or self._audio_chunk_count % 100 == 0:
-                logger.info(f"[AUDIO] Forwarding chunk #{self._audio_chunk_count}, length={len(audio_base64)}")
+            self._audio_chunk_count = count = self._audio_chunk_count + 1
+            if (count <= 3 or count % 100 == 0) and logger.isEnabledFor(logging.INFO):
+                logger.info("[AUDIO] Forwarding chunk #%d, length=%d", count, len(audio_base64))
             await self.connection.input_audio_buffer.append(audio=audio_base64)
         except Exception as e:
             logger.error(f"Error sending audio: {e}")
@@ -714,13 +1040,13 @@ class VoiceSessionHandler:
                 # Log diagnostic info about the SDP format
                 sdp_preview = client_sdp[:60] if client_sdp else '(empty)'
                 logger.info(f"[SDP-CHECK] client_sdp starts with: {sdp_preview}")
-                logger.info(f"[SDP-CHECK] client_sdp length: {len(client_sdp)}")
 
                 avatar_connect = ClientEventSessionAvatarConnect(
                     client_sdp=client_sdp,
                 )
-                serialized = avatar_connect.as_dict() if hasattr(avatar_connect, 'as_dict') else str(avatar_connect)
-                logger.info(f"[SEND] session.avatar.connect: {serialized}")
+                logger.info("[SEND] session.avatar.connect (sdp_len=%d)", len(client_sdp))
+                if _DEBUG_VERBOSE and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[SEND] session.avatar.connect: %s", avatar_connect.as_dict())
                 await self.connection.send(avatar_connect)
                 logger.info("Sent avatar SDP offer to Voice Live")
             except Exception as e:
@@ -749,51 +1075,86 @@ class VoiceSessionHandler:
         """
         if self.connection:
             try:
-                # Build session payload with avatar + preserved audio config
-                session_payload = {
-                    "avatar": avatar_data,
-                    "input_audio_format": "pcm16",
-                    "output_audio_format": "pcm16",
-                }
-
-                # Preserve turn detection config
-                td = self._build_turn_detection(self.config)
-                if hasattr(td, 'as_dict'):
-                    session_payload["turn_detection"] = td.as_dict()
-                elif hasattr(td, '__dict__'):
-                    session_payload["turn_detection"] = {k: v for k, v in td.__dict__.items() if not k.startswith('_')}
-
-                raw_event = {
-                    "type": "session.update",
-                    "session": session_payload,
-                }
-                raw_json = json.dumps(raw_event)
+                # Splice the avatar subtree into the pre-encoded envelope
+                # carrying the preserved audio config
+                raw_json = (
+                    self._scene_update_envelope() + orjson.dumps(avatar_data) + b"}}"
+                ).decode()
                 logger.info(f"[SEND] raw session.update (scene): {raw_json}")
                 await self.connection._connection.send_str(raw_json)
             except Exception as e:
                 logger.error(f"Error updating avatar scene: {e}", exc_info=True)
 
+    def _scene_update_envelope(self) -> bytes:
+        """Encoded session.update up to the avatar value, for scene updates.
+
+        Audio formats and turn detection only depend on the (frozen) session
+        config, so they are serialized once per session; each scene update
+        then only encodes the avatar subtree and closes the two objects.
+        """
+        if self._scene_update_prefix is None:
+            session = {
+                "input_audio_format": "pcm16",
+                "output_audio_format": "pcm16",
+            }
+            # Preserve turn detection config
+            td = self._build_turn_detection(self.ncfg)
+            if hasattr(td, 'as_dict'):
+                session["turn_detection"] = td.as_dict()
+            elif hasattr(td, '__dict__'):
+                session["turn_detection"] = {k: v for k, v in td.__dict__.items() if not k.startswith('_')}
+            encoded = orjson.dumps({"type": "session.update", "session": session})
+            # Reopen the session object: drop the closing "}}" and append the avatar key
+            self._scene_update_prefix = encoded[:-2] + b',"avatar":'
+        return self._scene_update_prefix
+
     async def stop(self):
         """Stop the session."""
         self.is_running = False
         self.connection = None
-
-    async def _wait_for_event(self, connection, wanted_types: set, timeout_s: float = 15.0):
-        """Wait for specific event types."""
-        logger.info(f"[WAIT] Waiting for event types: {wanted_types}")
-        async def _next():
-            async for event in connection:
-                etype = getattr(event, 'type', 'unknown')
-                if etype != ServerEventType.RESPONSE_AUDIO_DELTA:
-                    logger.info(f"[RECV-WAIT] {etype}: {event}")
-                if event.type in wanted_types:
-                    return event
-                # Continue handling other events while waiting
-                await self._handle_event(event, connection)
-            return None
-
+        for task in (self._audio_cork_task, self._video_cork_task, self._transcript_task):
+            if task is not None:
+                task.cancel()
+        for task in self._function_tasks:
+            task.cancel()
+
+    def _expect_event(self, wanted_types: frozenset) -> asyncio.Future:
+        """Register a future that _process_events resolves with the next matching event."""
+        waiter = asyncio.get_running_loop().create_future()
+        if self._event_task is not None and self._event_task.done():
+            # The receive loop has already ended; nothing will resolve it
+            waiter.set_exception(ConnectionError("Voice Live connection closed"))
+            return waiter
+        for etype in wanted_types:
+            self._waiters[etype].append(waiter)
+        return waiter
+
+    def _discard_waiter(self, waiter: asyncio.Future, wanted_types: frozenset):
+        if waiter.done() and not waiter.cancelled():
+            # Mark a failure nobody awaited as retrieved
+            waiter.exception()
+        for etype in wanted_types:
+            waiters = self._waiters.get(etype)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[etype]
+
+    async def _wait_for_event(self, wanted_types: frozenset, timeout_s: float = 15.0,
+                              waiter: Optional[asyncio.Future] = None):
+        """Wait for specific event types delivered by _process_events.
+
+        Pass a waiter from _expect_event when the event may arrive before
+        this coroutine gets to run.
+        """
+        if waiter is None:
+            waiter = self._expect_event(wanted_types)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[WAIT] Waiting for event types: %s", wanted_types)
         try:
-            return await asyncio.wait_for(_next(), timeout=timeout_s)
+            return await asyncio.wait_for(waiter, timeout=timeout_s)
         except asyncio.TimeoutError:
             logger.error(f"Timeout waiting for {wanted_types}")
             raise
+        finally:
+            self._discard_waiter(waiter, wanted_types)
@@ -4,18 +4,29 @@ Clean implementation using webhandler.py for cloud/container deployments
 """
 
 import asyncio
-import json
+import importlib.util
 import logging
-import base64
-from typing import Dict, List, Optional
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
 import uvicorn
 import os
 
-from web_handler import WebSocketVoiceClient, VoiceAssistantBridge
+from dispatch import (
+    AudioChunk,
+    FrontendMessage,
+    Interrupt,
+    SendAudio,
+    StartSession,
+    StopSession,
+    decode_frontend_message,
+)
+from web_handler import WS_FRAME_AUDIO, WebSocketVoiceClient, VoiceAssistantBridge
 from azure.core.credentials import AzureKeyCredential
 
 # Set up logging
@@ -24,6 +35,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Deployment settings, resolved once at import
+AZURE_VOICELIVE_ENDPOINT = os.getenv("AZURE_VOICELIVE_ENDPOINT")
+AZURE_VOICELIVE_API_KEY = os.getenv("AZURE_VOICELIVE_API_KEY")
+VOICELIVE_MODEL = os.getenv("VOICELIVE_MODEL", "gpt-realtime")
+VOICELIVE_VOICE = os.getenv("VOICELIVE_VOICE", "en-US-Ava:DragonHDLatestNeural")
+VOICELIVE_TRANSCRIBE_MODEL = os.getenv(
+    "VOICELIVE_TRANSCRIBE_MODEL", "gpt-4o-transcribe"
+)
+# Set SERVE_STATIC=0 when a reverse proxy/CDN serves the built frontend
+SERVE_STATIC = os.getenv("SERVE_STATIC", "1") == "1"
+
+if not AZURE_VOICELIVE_ENDPOINT or not AZURE_VOICELIVE_API_KEY:
+    logger.error(
+        "AZURE_VOICELIVE_ENDPOINT and AZURE_VOICELIVE_API_KEY must be set; "
+        "voice sessions will fail to start"
+    )
+
 
 # Global bridge instance
 bridge = VoiceAssistantBridge()
@@ -33,6 +61,24 @@ bridge = VoiceAssistantBridge()
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     logger.info("Starting WebSocket server...")
+
+    # Instructions and tool definitions are the same for every session; load them once
+    instructions_path = os.path.join(
+        os.path.dirname(__file__), "shared", "instructions.txt"
+    )
+    with open(instructions_path, "r", encoding="utf-8") as f:
+        app.state.instructions = f.read()
+
+    # Load tools from YAML configuration
+    from tool_loader import get_tool_loader
+
+    tool_loader = get_tool_loader()
+    app.state.tools = tool_loader.get_tool_definitions()
+
+    # Log tool environment info
+    env_info = tool_loader.get_environment_info()
+    logger.info(f"Tool environment: {env_info}")
+
     yield
     logger.info("Shutting down WebSocket server...")
 
@@ -43,6 +89,7 @@ app = FastAPI(
     description="WebSocket bridge for Azure VoiceLive API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -66,9 +113,9 @@ async def health_check():
 async def get_config():
     """Get voice assistant configuration for frontend"""
     return {
-        "model": os.getenv("VOICELIVE_MODEL", "gpt-realtime"),
-        "voice": os.getenv("VOICELIVE_VOICE", "en-US-Ava:DragonHDLatestNeural"),
-        "transcribeModel": os.getenv("VOICELIVE_TRANSCRIBE_MODEL", "gpt-4o-transcribe"),
+        "model": VOICELIVE_MODEL,
+        "voice": VOICELIVE_VOICE,
+        "transcribeModel": VOICELIVE_TRANSCRIBE_MODEL,
     }
 
 
@@ -80,13 +127,24 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
 
     try:
         while True:
-            # Receive message from frontend
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+
+            # Microphone audio arrives as binary frames: tag byte + raw PCM16
+            data = frame.get("bytes")
+            if data is not None:
+                if len(data) > 1 and data[:1] == WS_FRAME_AUDIO:
+                    await handle_audio_bytes(client_id, memoryview(data)[1:])
+                continue
+
+            # Everything else is a JSON control message in a text frame
+            message = decode_frontend_message(frame["text"])
+            if message is None:
+                continue
 
             await handle_frontend_message(client_id, message, websocket)
 
-    except WebSocketDisconnect:
         logger.info(f"Client {client_id} disconnected")
     except Exception as e:
         logger.error(f"WebSocket error for client {client_id}: {e}")
@@ -94,80 +152,41 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str):
         await bridge.disconnect(client_id)
 
 
-async def handle_frontend_message(client_id: str, message: dict, websocket: WebSocket):
+async def handle_frontend_message(
+    client_id: str, message: FrontendMessage, websocket: WebSocket
+):
     """Handle messages from frontend"""
-    message_type = message.get("type")
-
-    if message_type == "start_session":
-        await start_voice_session(client_id, message.get("config", {}))
-
-    elif message_type == "stop_session":
-        await stop_voice_session(client_id)
-
-    elif message_type == "send_audio":
-        await handle_audio_input(client_id, message.get("audio"))
-
-    elif message_type == "interrupt":
-        await interrupt_assistant(client_id)
-
-    elif message_type == "audio_chunk":
-        # Handle real-time audio streaming from frontend
-        await handle_audio_chunk(client_id, message.get("data"))
-
-    else:
-        logger.warning(f"Unknown message type: {message_type}")
+    await _HANDLERS[type(message)](client_id, message)
 
 
 async def start_voice_session(client_id: str, config: dict):
     """Start a voice session for the client"""
     try:
-        # Get environment variables
-        endpoint = os.getenv("AZURE_VOICELIVE_ENDPOINT")
-        api_key = os.getenv("AZURE_VOICELIVE_API_KEY")
-
-        if not endpoint or not api_key:
+        if not AZURE_VOICELIVE_ENDPOINT or not AZURE_VOICELIVE_API_KEY:
             raise ValueError("Missing Azure VoiceLive configuration")
 
         # Create credential
-        credential = AzureKeyCredential(api_key)
-
-        # Load instructions
-        instructions_path = os.path.join(
-            os.path.dirname(__file__), "shared", "instructions.txt"
-        )
-        with open(instructions_path, "r", encoding="utf-8") as f:
-            instructions = f.read()
+        credential = AzureKeyCredential(AZURE_VOICELIVE_API_KEY)
 
-        # Load tools from YAML configuration
-        from tool_loader import get_tool_loader
-
-        tool_loader = get_tool_loader()
-        tools = tool_loader.get_tool_definitions()
-
-        # Log tool environment info
-        env_info = tool_loader.get_environment_info()
-        logger.info(f"Tool environment: {env_info}")
+        # Loaded once at startup by lifespan()
+        instructions = app.state.instructions
+        tools = app.state.tools
 
         # Create audio streaming callback
         async def stream_audio_to_client(audio_data: bytes):
-            """Stream audio data to frontend via WebSocket."""
+            """Stream audio data to frontend as a binary WebSocket frame."""
             try:
-                # Encode audio data as base64 for WebSocket transmission
-                audio_base64 = base64.b64encode(audio_data).decode("utf-8")
-
-                message = {
-                    "type": "audio_data",
-                    "data": audio_base64,
-                    "format": "pcm16",
-                    "sample_rate": 24000,
-                    "channels": 1,
-                    "timestamp": asyncio.get_event_loop().time(),
-                }
-
-                await bridge.send_message(client_id, message)
-                logger.debug(
-                    f"🔊 Audio data streamed to client {client_id} ({len(audio_data)} bytes)"
-                )
+                # Raw PCM16 behind a one-byte type tag, no base64/JSON wrapping.
+                # The frame is queued for the writer task, so it must own its
+                # bytes: one concat is the only allocation, and a shared
+                # scratch buffer would be overwritten before it is sent.
+                await bridge.send_bytes(client_id, WS_FRAME_AUDIO + audio_data)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "🔊 Audio data streamed to client %s (%d bytes)",
+                        client_id,
+                        len(audio_data),
+                    )
 
             except Exception as e:
                 logger.error(f"Failed to stream audio to client {client_id}: {e}")
@@ -175,16 +194,12 @@ async def start_voice_session(client_id: str, config: dict):
         # Create voice client with audio streaming support
         voice_client = WebSocketVoiceClient(
             client_id=client_id,
-            endpoint=endpoint,
+            endpoint=AZURE_VOICELIVE_ENDPOINT,
             credential=credential,
             bridge=bridge,
-            model=config.get("model", os.getenv("VOICELIVE_MODEL", "gpt-realtime")),
-            voice=config.get(
-                "voice", os.getenv("VOICELIVE_VOICE", "en-US-Ava:DragonHDLatestNeural")
-            ),
-            transcribe_model=config.get(
-                "transcribeModel", os.getenv("VOICELIVE_TRANSCRIBE_MODEL", "gpt-4o-transcribe")
-            ),
+            model=config.get("model", VOICELIVE_MODEL),
+            voice=config.get("voice", VOICELIVE_VOICE),
+            transcribe_model=config.get("transcribeModel", VOICELIVE_TRANSCRIBE_MODEL),
             instructions=instructions,
             tools=tools,
             websocket_callback=stream_audio_to_client,
@@ -226,10 +241,9 @@ async def start_voice_session(client_id: str, config: dict):
 
 async def stop_voice_session(client_id: str):
     """Stop voice session for the client"""
-    if client_id in bridge.voice_clients:
-        voice_client = bridge.voice_clients[client_id]
+    voice_client = bridge.voice_clients.pop(client_id, None)
+    if voice_client is not None:
         await voice_client.cleanup()
-        del bridge.voice_clients[client_id]
 
         await bridge.send_message(
             client_id, {"type": "session_stopped", "status": "success"}
@@ -239,39 +253,54 @@ async def stop_voice_session(client_id: str):
 
 async def handle_audio_input(client_id: str, audio_data: str):
     """Handle audio input from frontend (legacy method)"""
-    if client_id not in bridge.voice_clients:
+    voice_client = bridge.voice_clients.get(client_id)
+    if voice_client is None:
         return
 
-    voice_client = bridge.voice_clients[client_id]
     try:
         # Audio data should be base64 encoded
         await voice_client.process_audio_input(audio_data)
-        logger.debug(f"Audio input processed for client {client_id}")
+        logger.debug("Audio input processed for client %s", client_id)
     except Exception as e:
         logger.error(f"Error handling audio input for {client_id}: {e}")
 
 
 async def handle_audio_chunk(client_id: str, audio_base64: str):
     """Handle real-time audio chunks from frontend"""
-    if client_id not in bridge.voice_clients:
+    voice_client = bridge.voice_clients.get(client_id)
+    if voice_client is None:
         logger.warning(f"No voice client found for {client_id}")
         return
 
-    voice_client = bridge.voice_clients[client_id]
+    if not audio_base64:
+        return
+
     try:
-        # Process audio chunk
+        # The SDK takes base64 and forwards it as-is, so the chunk is never decoded here
         await voice_client.process_audio_input(audio_base64)
-        logger.debug(f"Audio chunk processed for client {client_id}")
+        logger.debug("Audio chunk processed for client %s", client_id)
     except Exception as e:
         logger.error(f"Error handling audio chunk for {client_id}: {e}")
 
 
+async def handle_audio_bytes(client_id: str, raw_pcm):
+    """Handle real-time raw PCM16 audio from frontend binary frames"""
+    voice_client = bridge.voice_clients.get(client_id)
+    if voice_client is None:
+        return
+
+    try:
+        await voice_client.process_audio_bytes(raw_pcm)
+    except Exception as e:
+        logger.error(f"Error handling audio frame for {client_id}: {e}")
+
+
 async def interrupt_assistant(client_id: str):
     """Interrupt the assistant's current response"""
-    if client_id not in bridge.voice_clients:
+    voice_client = bridge.voice_clients.get(client_id)
+    if voice_client is None:
         return
 
-    voice_client = bridge.voice_clients[client_id]
     try:
         await voice_client.interrupt_response()
         await bridge.send_message(
@@ -279,7 +308,7 @@ async def interrupt_assistant(client_id: str):
             {
                 "type": "assistant_interrupted",
                 "status": "success",
-                "timestamp": asyncio.get_event_loop().time(),
+                "timestamp": time.monotonic(),
             },
         )
         logger.info(f"Assistant interrupted for client {client_id}")
@@ -287,9 +316,20 @@ async def interrupt_assistant(client_id: str):
         logger.error(f"Error interrupting assistant for {client_id}: {e}")
 
 
+# Frontend message type -> handler, unpacking the fields each handler needs
+_HANDLERS: Dict[type, Callable[[str, FrontendMessage], Awaitable[None]]] = {
+    # Handle real-time audio streaming from frontend
+    AudioChunk: lambda client_id, m: handle_audio_chunk(client_id, m.data),
+    StartSession: lambda client_id, m: start_voice_session(client_id, m.config),
+    StopSession: lambda client_id, m: stop_voice_session(client_id),
+    SendAudio: lambda client_id, m: handle_audio_input(client_id, m.audio),
+    Interrupt: lambda client_id, m: interrupt_assistant(client_id),
+}
+
+
 # Mount static files for frontend
 static_path = os.path.join(os.path.dirname(__file__), "static")
-if os.path.exists(static_path):
+if SERVE_STATIC and os.path.exists(static_path):
     # Mount ALL static files at root level - this is the key fix
     app.mount("/", StaticFiles(directory=static_path, html=True), name="static")
 else:
@@ -302,5 +342,20 @@ else:
         }
 
 
+# uvloop is not available on Windows; fall back to the stdlib event loop there
+EVENT_LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True, log_level="info")
+    # DEV_RELOAD=1 restarts on code changes; the reloader is off by default
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=bool(os.getenv("DEV_RELOAD")),
+        log_level="info",
+        loop=EVENT_LOOP,
+        http="httptools",
+        # Per-request access lines add nothing for a WebSocket-first server
+        access_log=False,
+    )
@@ -0,0 +1,45 @@
+"""
+Frontend message types for the Voice Assistant WebSocket
+Decodes inbound JSON text frames into typed structs, tagged by "type"
+"""
+
+import logging
+from typing import Optional, Union
+
+import msgspec
+
+logger = logging.getLogger(__name__)
+
+
+class StartSession(msgspec.Struct, tag="start_session", tag_field="type"):
+    config: dict = {}
+
+
+class StopSession(msgspec.Struct, tag="stop_session", tag_field="type"):
+    pass
+
+
+class SendAudio(msgspec.Struct, tag="send_audio", tag_field="type"):
+    audio: Optional[str] = None
+
+
+class Interrupt(msgspec.Struct, tag="interrupt", tag_field="type"):
+    pass
+
+
+class AudioChunk(msgspec.Struct, tag="audio_chunk", tag_field="type"):
+    data: Optional[str] = None
+
+
+FrontendMessage = Union[StartSession, StopSession, SendAudio, Interrupt, AudioChunk]
+
+_decoder = msgspec.json.Decoder(FrontendMessage)
+
+
+def decode_frontend_message(data: str) -> Optional[FrontendMessage]:
+    """Decode one frontend text frame; returns None for unknown or invalid messages."""
+    try:
+        return _decoder.decode(data)
+    except msgspec.DecodeError as e:
+        logger.warning(f"Unknown or invalid message: {e}")
+        return None
@@ -28,6 +28,8 @@ class ToolConfigLoader:
         self.config = {}
         self.tools = []
         self.environment = os.getenv("ENVIRONMENT", "production")
+        # Imported implementations, shared by every client until reload()
+        self._implementations: Optional[Dict[str, Callable]] = None
 
         self._load_config()
 
@@ -112,9 +114,17 @@ class ToolConfigLoader:
         """
         Get function implementations by importing them dynamically.
 
+        The table is built once and reused until reload().
+
         Returns:
             Dictionary mapping function names to callable implementations
         """
+        if self._implementations is None:
+            self._implementations = self._load_function_implementations()
+        return self._implementations
+
+    def _load_function_implementations(self) -> Dict[str, Callable]:
+        """Import every enabled tool's implementation."""
         tools = self.config.get("tools", [])
         env_config = self.get_environment_config()
 
@@ -246,6 +256,7 @@ class ToolConfigLoader:
 
     def reload(self):
         """Reload configuration from file."""
+        self._implementations = None
         self._load_config()
         logger.info("Tool configuration reloaded")
 
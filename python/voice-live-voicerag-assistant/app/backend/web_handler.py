@@ -5,11 +5,14 @@ Handles audio streaming via WebSocket to/from frontend.
 """
 
 import asyncio
-import json
+import itertools
 import logging
-import base64
+import binascii
 import os
-from typing import Dict, Any, Optional, Callable
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Callable, Set
+
+import orjson
 from azure.core.credentials import AzureKeyCredential
 from azure.ai.voicelive.aio import connect
 from azure.ai.voicelive.models import (
@@ -36,6 +39,54 @@ from fastapi import WebSocket
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Type tag of binary WebSocket frames carrying assistant PCM16 audio
+# (24kHz mono); the raw samples follow the tag byte. JSON control frames
+# are binary too and always start with "{" or "["
+WS_FRAME_AUDIO = b"\x01"
+
+# Upper bound on the PCM payload of one coalesced outbound audio frame
+AUDIO_BATCH_MAX_BYTES = 64 * 1024
+
+# Items buffered per client before a slow browser starts losing audio
+OUTBOUND_QUEUE_SIZE = 256
+
+# Outbound queue item kinds; consecutive items of one kind are sent together
+_KIND_JSON = 0
+_KIND_AUDIO = 1
+_KIND_BINARY = 2
+
+# Event types awaited through _wait_for_event
+_WAIT_SESSION_UPDATED = frozenset({ServerEventType.SESSION_UPDATED})
+_WAIT_FUNCTION_ARGS_DONE = frozenset(
+    {ServerEventType.RESPONSE_FUNCTION_CALL_ARGUMENTS_DONE}
+)
+_WAIT_RESPONSE_DONE = frozenset({ServerEventType.RESPONSE_DONE})
+
+
+class _EncodedJson(bytes):
+    """A JSON control message serialized ahead of time."""
+
+    __slots__ = ()
+
+
+def _frame_kind(item) -> int:
+    if not isinstance(item, bytes) or type(item) is _EncodedJson:
+        return _KIND_JSON
+    return _KIND_AUDIO if item[:1] == WS_FRAME_AUDIO else _KIND_BINARY
+
+
+def _stop_playback_prefix(reason: str) -> bytes:
+    return orjson.dumps({"type": "stop_playback", "reason": reason})[:-1] + b',"timestamp":'
+
+
+# stop_playback only varies by its timestamp, which is spliced onto these
+_STOP_PLAYBACK_USER = _stop_playback_prefix("user_interruption")
+_STOP_PLAYBACK_MANUAL = _stop_playback_prefix("manual_interrupt")
+
+
+def _stop_playback(prefix: bytes, timestamp: float) -> _EncodedJson:
+    return _EncodedJson(prefix + orjson.dumps(timestamp) + b"}")
+
 
 class WebSocketAudioProcessor:
     """
@@ -71,6 +122,16 @@ class WebSocketAudioProcessor:
         except Exception as e:
             logger.error(f"Error processing input audio: {e}")
 
+    async def process_input_audio_bytes(self, raw_pcm, connection):
+        """Process raw PCM16 received from frontend as a binary frame."""
+        try:
+            # The SDK only takes base64 (and sends it on untouched), so this
+            # single C-level encode is the only codec pass on the input path
+            audio_base64 = binascii.b2a_base64(raw_pcm, newline=False).decode("ascii")
+            await connection.input_audio_buffer.append(audio=audio_base64)
+        except Exception as e:
+            logger.error(f"Error processing input audio: {e}")
+
     async def start(self):
         """Start the audio processor."""
         self.is_active = True
@@ -87,54 +148,172 @@ class WebSocketAudioProcessor:
         self.websocket_callback = None
         logger.info("WebSocket audio processor cleaned up")
 
-    async def stop_playback(self):
-        """Stop audio playback immediately."""
-        if self.websocket_callback:
-            try:
-                # Send stop signal via WebSocket
-                await self.websocket_callback(b'')  # Empty audio = stop signal
-            except Exception as e:
-                logger.error(f"Error stopping playback: {e}")
-        logger.info("Audio playback stopped")
-
 class VoiceAssistantBridge:
     """Bridge between frontend WebSocket and Azure VoiceLive API"""
 
+    __slots__ = ("active_connections", "voice_clients", "_outbound", "_writers", "_dropped")
+
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.voice_clients: Dict[str, WebSocketVoiceClient] = {}
+        # Outbound frames per client, drained by one writer task each
+        self._outbound: Dict[str, asyncio.Queue] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        # Audio frames dropped per client because its queue was full
+        self._dropped: Dict[str, int] = {}
 
     async def connect(self, websocket: WebSocket, client_id: str):
         """Accept a new WebSocket connection"""
+        # No TCP_NODELAY tweak needed: asyncio and uvloop TCP transports
+        # already disable Nagle on every accepted socket
         await websocket.accept()
         self.active_connections[client_id] = websocket
+        # A reconnect with the same id replaces the old writer and its queue
+        writer = self._writers.pop(client_id, None)
+        if writer is not None:
+            writer.cancel()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+        self._outbound[client_id] = queue
+        self._dropped[client_id] = 0
+        self._writers[client_id] = asyncio.create_task(
+            self._writer(client_id, websocket, queue)
+        )
         logger.info(f"Client {client_id} connected")
 
     async def disconnect(self, client_id: str):
         """Handle WebSocket disconnection"""
         if client_id in self.active_connections:
             del self.active_connections[client_id]
-        if client_id in self.voice_clients:
+        self._outbound.pop(client_id, None)
+        self._dropped.pop(client_id, None)
+        writer = self._writers.pop(client_id, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        voice_client = self.voice_clients.pop(client_id, None)
+        if voice_client is not None:
             # Cleanup voice client
-            voice_client = self.voice_clients[client_id]
             await voice_client.cleanup()
-            del self.voice_clients[client_id]
         logger.info(f"Client {client_id} disconnected")
 
     async def send_message(self, client_id: str, message: dict):
-        """Send message to specific client"""
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
+        """Queue a JSON message for specific client"""
+        queue = self._outbound.get(client_id)
+        if queue is not None:
+            await self._enqueue(client_id, queue, message)
+
+    async def send_messages(self, client_id: str, messages: list):
+        """Queue several JSON messages so they go out in one frame"""
+        queue = self._outbound.get(client_id)
+        if queue is not None:
+            for message in messages:
+                await self._enqueue(client_id, queue, message)
+
+    async def send_stop_playback(self, client_id: str, message: _EncodedJson):
+        """Queue stop_playback, discarding assistant audio not yet sent"""
+        queue = self._outbound.get(client_id)
+        if queue is None:
+            return
+        # Audio still queued would only be played and then cut off; dropping
+        # it puts the stop signal on the wire with the next write
+        kept = []
+        while not queue.empty():
+            item = queue.get_nowait()
+            if _frame_kind(item) != _KIND_AUDIO:
+                kept.append(item)
+        for item in kept:
+            queue.put_nowait(item)
+        await self._enqueue(client_id, queue, message)
+
+    async def send_bytes(self, client_id: str, data: bytes):
+        """Queue a binary frame for specific client"""
+        queue = self._outbound.get(client_id)
+        if queue is not None:
+            await self._enqueue(client_id, queue, data)
+
+    async def _enqueue(self, client_id: str, queue: asyncio.Queue, item):
+        """Queue one item, dropping audio rather than waiting when the queue is full.
+
+        A stalled browser must not block the VoiceLive receive loop on audio;
+        control messages are rare and still wait for room.
+        """
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if _frame_kind(item) == _KIND_AUDIO:
+                dropped = self._dropped.get(client_id, 0) + 1
+                self._dropped[client_id] = dropped
+                if dropped == 1 or dropped % 100 == 0:
+                    logger.warning(
+                        f"Outbound queue full for {client_id}, dropped {dropped} audio frames"
+                    )
+                return
+            await queue.put(item)
+
+    async def _writer(self, client_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain everything queued since the last send and write it out.
+
+        Consecutive JSON messages are sent as one array frame and consecutive
+        audio chunks as one audio frame. Runs of different kinds keep their
+        order, so audio never overtakes or trails control messages such as
+        stop_playback.
+        """
+        # Reused for every coalesced audio frame; only this task touches it
+        audio_buf = bytearray(WS_FRAME_AUDIO)
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
             try:
-                await websocket.send_text(json.dumps(message))
+                for kind, run in itertools.groupby(batch, _frame_kind):
+                    if kind == _KIND_JSON:
+                        await self._send_json(websocket, list(run))
+                    elif kind == _KIND_AUDIO:
+                        await self._send_audio(websocket, run, audio_buf)
+                    else:
+                        for item in run:
+                            await websocket.send_bytes(item)
             except Exception as e:
                 logger.error(f"Error sending message to {client_id}: {e}")
                 await self.disconnect(client_id)
+                return
+
+    @staticmethod
+    async def _send_json(websocket: WebSocket, messages: list):
+        if len(messages) == 1:
+            message = messages[0]
+            payload = message if type(message) is _EncodedJson else orjson.dumps(message)
+        elif any(type(message) is _EncodedJson for message in messages):
+            payload = b"[" + b",".join(
+                message if type(message) is _EncodedJson else orjson.dumps(message)
+                for message in messages
+            ) + b"]"
+        else:
+            payload = orjson.dumps(messages)
+        # orjson already produced UTF-8; a binary frame skips a decode/encode pass
+        await websocket.send_bytes(payload)
+
+    @staticmethod
+    async def _send_audio(websocket: WebSocket, frames, buf: bytearray):
+        """Merge tagged audio frames into as few frames as the size cap allows.
+
+        buf holds the tag byte and is grown in place, so a flush costs one
+        bytes() snapshot rather than a parts list plus a join.
+        """
+        for frame in frames:
+            if len(buf) > 1 and len(buf) + len(frame) - 2 > AUDIO_BATCH_MAX_BYTES:
+                await websocket.send_bytes(bytes(buf))
+                del buf[1:]
+            buf += memoryview(frame)[1:]
+        if len(buf) > 1:
+            await websocket.send_bytes(bytes(buf))
+            del buf[1:]
 
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
-        for client_id in list(self.active_connections.keys()):
-            await self.send_message(client_id, message)
+        # Serialize once; every client queues the same bytes
+        encoded = _EncodedJson(orjson.dumps(message))
+        for client_id, queue in list(self._outbound.items()):
+            await self._enqueue(client_id, queue, encoded)
 
 
 class WebSocketVoiceClient:
@@ -143,6 +322,31 @@ class WebSocketVoiceClient:
     Handles voice conversation via Azure VoiceLive API with WebSocket audio streaming.
     """
 
+    __slots__ = (
+        "client_id",
+        "endpoint",
+        "credential",
+        "model",
+        "voice",
+        "transcribe_model",
+        "instructions",
+        "tools",
+        "websocket_callback",
+        "bridge",
+        "conversation_started",
+        "audio_processor",
+        "connection",
+        "session",
+        "is_running",
+        "function_call_in_progress",
+        "active_call_id",
+        "available_functions",
+        "_event_task",
+        "_waiters",
+        "_function_tasks",
+        "_dispatch",
+    )
+
     def __init__(
         self,
         client_id: str,
@@ -181,6 +385,28 @@ class WebSocketVoiceClient:
         self.function_call_in_progress = False
         self.active_call_id = None
 
+        # _process_events is the only reader of the connection; coroutines
+        # waiting for an event type park a future here until it arrives
+        self._event_task: Optional[asyncio.Task] = None
+        self._waiters: Dict[str, List[asyncio.Future]] = defaultdict(list)
+        self._function_tasks: Set[asyncio.Task] = set()
+
+        # Event type -> handler; event types without an entry are ignored
+        self._dispatch: Dict[str, Callable] = {
+            ServerEventType.RESPONSE_AUDIO_DELTA: self._on_audio_delta,
+            ServerEventType.RESPONSE_AUDIO_DONE: self._on_audio_done,
+            ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STARTED: self._on_speech_started,
+            ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STOPPED: self._on_speech_stopped,
+            ServerEventType.RESPONSE_CREATED: self._on_response_created,
+            ServerEventType.RESPONSE_DONE: self._on_response_done,
+            # Function call events
+            ServerEventType.CONVERSATION_ITEM_CREATED: self._handle_conversation_item_created,
+            ServerEventType.CONVERSATION_ITEM_INPUT_AUDIO_TRANSCRIPTION_COMPLETED: (
+                self._on_transcription_completed
+            ),
+            ServerEventType.ERROR: self._on_error,
+        }
+
         # Available functions - load from YAML configuration
         self.available_functions = {}
         self._register_functions()
@@ -219,13 +445,19 @@ class WebSocketVoiceClient:
                 # Start audio processor
                 await self.audio_processor.start()
 
-                # Configure session
-                await self._setup_session(connection)
+                # Process events; session setup waits on this for SESSION_UPDATED
+                self._event_task = asyncio.create_task(
+                    self._process_events(connection)
+                )
+                try:
+                    # Configure session
+                    await self._setup_session(connection)
 
-                logger.info("🎤 Voice assistant ready! Start speaking...")
+                    logger.info("🎤 Voice assistant ready! Start speaking...")
 
-                # Process events
-                await self._process_events(connection)
+                    await self._event_task
+                finally:
+                    self._event_task.cancel()
 
         except Exception as e:
             logger.error(f"Voice client error: {e}")
@@ -291,11 +523,7 @@ class WebSocketVoiceClient:
 
             # Wait for session to be ready
             try:
-                session_updated = await self._wait_for_event(
-                    connection, {ServerEventType.SESSION_UPDATED}
-                )
-                if session_updated is None:
-                    raise ValueError("SESSION_UPDATED event not received")
+                session_updated = await self._wait_for_event(_WAIT_SESSION_UPDATED)
                 if (
                     not hasattr(session_updated, "session")
                     or session_updated.session is None
@@ -327,65 +555,79 @@ class WebSocketVoiceClient:
             raise
 
     async def _process_events(self, connection):
-        """Process incoming events from VoiceLive API."""
+        """Process incoming events from VoiceLive API.
+
+        This is the single consumer of the connection: coroutines waiting in
+        _wait_for_event are resolved here before the event is dispatched.
+        """
         try:
             async for event in connection:
                 if not self.is_running:
                     break
 
+                if self._waiters:
+                    waiters = self._waiters.pop(event.type, None)
+                    if waiters:
+                        for waiter in waiters:
+                            if not waiter.done():
+                                waiter.set_result(event)
+
                 await self._handle_event(event, connection)
 
         except Exception as e:
             logger.error(f"Error processing events: {e}")
             raise
+        finally:
+            # Nothing else will arrive; fail anyone still waiting so their
+            # usual error handling (tool_call_error, "Voice client error") runs
+            for waiters in self._waiters.values():
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(ConnectionError("Voice Live connection closed"))
+            self._waiters.clear()
 
     async def _handle_event(self, event, connection):
         """Handle individual events from VoiceLive API."""
         try:
-            event_type = event.type
+            handler = self._dispatch.get(event.type)
+            if handler is not None:
+                await handler(event, connection)
 
-            # Audio events
-            if event_type == ServerEventType.RESPONSE_AUDIO_DELTA:
-                if hasattr(event, "delta") and event.delta:
-                    await self.audio_processor.queue_audio(event.delta)
+        except Exception as e:
+            logger.error(f"Error handling event {event.type}: {e}")
 
-            elif event_type == ServerEventType.RESPONSE_AUDIO_DONE:
-                logger.info("🔊 Audio response complete")
+    # Audio events
+    async def _on_audio_delta(self, event, connection):
+        if hasattr(event, "delta") and event.delta:
+            await self.audio_processor.queue_audio(event.delta)
 
-            # Speech detection events
-            elif event_type == ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STARTED:
-                logger.info("🎤 User started speaking")
-                await self._handle_user_interruption(connection)
+    async def _on_audio_done(self, event, connection):
+        logger.info("🔊 Audio response complete")
 
-            elif event_type == ServerEventType.INPUT_AUDIO_BUFFER_SPEECH_STOPPED:
-                logger.info("🎤 User stopped speaking")
-                await self._handle_user_speech_end()
+    # Speech detection events
+    async def _on_speech_started(self, event, connection):
+        logger.info("🎤 User started speaking")
+        await self._handle_user_interruption(connection)
 
-            # Response events
-            elif event_type == ServerEventType.RESPONSE_CREATED:
-                logger.info("🤖 Assistant response created")
+    async def _on_speech_stopped(self, event, connection):
+        logger.info("🎤 User stopped speaking")
+        await self._handle_user_speech_end()
 
-            elif event_type == ServerEventType.RESPONSE_DONE:
-                logger.info("✅ Response complete")
+    # Response events
+    async def _on_response_created(self, event, connection):
+        logger.info("🤖 Assistant response created")
 
-            # Function call events
-            elif event_type == ServerEventType.CONVERSATION_ITEM_CREATED:
-                await self._handle_conversation_item_created(event, connection)
+    async def _on_response_done(self, event, connection):
+        logger.info("✅ Response complete")
 
-            # Text transcription events
-            elif (
-                event_type
-                == ServerEventType.CONVERSATION_ITEM_INPUT_AUDIO_TRANSCRIPTION_COMPLETED
-            ):
-                if hasattr(event, "transcript"):
-                    logger.info(f"📝 Transcription: {event.transcript}")
+    # Text transcription events
+    async def _on_transcription_completed(self, event, connection):
+        if hasattr(event, "transcript"):
+            logger.info(f"📝 Transcription: {event.transcript}")
 
-            # Error events
-            elif event_type == ServerEventType.ERROR:
-                logger.error(f"❌ VoiceLive error: {event}")
-
-        except Exception as e:
-            logger.error(f"Error handling event {event_type}: {e}")
+    # Error events
+    async def _on_error(self, event, connection):
+        logger.error(f"❌ VoiceLive error: {event}")
 
     async def _handle_conversation_item_created(self, event, connection):
         """Handle conversation item creation, including function calls."""
@@ -402,24 +644,35 @@ class WebSocketVoiceClient:
                 and item.type == ItemType.FUNCTION_CALL
                 and hasattr(item, "call_id")
             ):
-
-                await self._handle_function_call_with_improved_pattern(
-                    event, connection
+                # Register before returning to the event loop so neither event
+                # can slip past; the call runs as a task since it waits on it
+                args_waiter = self._expect_event(_WAIT_FUNCTION_ARGS_DONE)
+                done_waiter = self._expect_event(_WAIT_RESPONSE_DONE)
+                task = asyncio.create_task(
+                    self._handle_function_call_with_improved_pattern(
+                        event, connection, args_waiter, done_waiter
+                    )
                 )
+                self._function_tasks.add(task)
+                task.add_done_callback(self._function_tasks.discard)
 
         except Exception as e:
             logger.error(f"Error handling conversation item: {e}")
 
     async def _handle_function_call_with_improved_pattern(
-        self, conversation_created_event, connection
+        self,
+        conversation_created_event,
+        connection,
+        args_waiter: asyncio.Future,
+        done_waiter: asyncio.Future,
     ):
         """Enhanced function call handler with WebSocket events"""
         # Validate the event structure
-        if not isinstance(conversation_created_event, type(conversation_created_event)):
+        if not isinstance(conversation_created_event, ServerEventConversationItemCreated):
             logger.error("Expected ServerEventConversationItemCreated")
             return
 
-        if not hasattr(conversation_created_event.item, "call_id"):
+        if not isinstance(conversation_created_event.item, ResponseFunctionCallItem):
             logger.error("Expected ResponseFunctionCallItem")
             return
 
@@ -429,6 +682,11 @@ class WebSocketVoiceClient:
         previous_item_id = function_call_item.id
 
         logger.info(f"Function call detected: {function_name} with call_id: {call_id}")
+        loop = asyncio.get_running_loop()
+
+        # Tool call events held back to share a frame with the next one
+        pending = []
+        exec_task: Optional[asyncio.Task] = None
 
         # Send function call started event
         await self.bridge.send_message(
@@ -437,7 +695,7 @@ class WebSocketVoiceClient:
                 "type": "tool_call_started",
                 "function_name": function_name,
                 "call_id": call_id,
-                "timestamp": asyncio.get_event_loop().time(),
+                "timestamp": loop.time(),
             },
         )
 
@@ -448,7 +706,7 @@ class WebSocketVoiceClient:
 
             # Wait for the function arguments to be complete
             function_done = await self._wait_for_event(
-                connection, {ServerEventType.RESPONSE_FUNCTION_CALL_ARGUMENTS_DONE}
+                _WAIT_FUNCTION_ARGS_DONE, waiter=args_waiter
             )
 
             if function_done.call_id != call_id:
@@ -460,40 +718,44 @@ class WebSocketVoiceClient:
             arguments = function_done.arguments
             logger.info(f"Function arguments received: {arguments}")
 
-            # Send function arguments received event
-            await self.bridge.send_message(
-                self.client_id,
+            # Function arguments received event, sent with the next status
+            pending.append(
                 {
                     "type": "tool_call_arguments",
                     "function_name": function_name,
                     "call_id": call_id,
                     "arguments": arguments,
-                    "timestamp": asyncio.get_event_loop().time(),
-                },
+                    "timestamp": loop.time(),
+                }
             )
 
-            # Wait for response to be done before proceeding
-            await self._wait_for_event(connection, {ServerEventType.RESPONSE_DONE})
-
             # Execute the function if we have it
             if function_name in self.available_functions:
                 logger.info(f"Executing function: {function_name}")
 
                 # Send function executing event
-                await self.bridge.send_message(
-                    self.client_id,
+                pending.append(
                     {
                         "type": "tool_call_executing",
                         "function_name": function_name,
                         "call_id": call_id,
-                        "timestamp": asyncio.get_event_loop().time(),
-                    },
+                        "timestamp": loop.time(),
+                    }
                 )
+                await self.bridge.send_messages(self.client_id, pending)
+                pending = []
+
+                async def _execute():
+                    started = loop.time()
+                    result = await self.available_functions[function_name](arguments)
+                    return result, started, loop.time()
+
+                # Run the function while the model finishes its response
+                exec_task = asyncio.create_task(_execute())
 
-                # Execute the function
-                start_time = asyncio.get_event_loop().time()
-                result = await self.available_functions[function_name](arguments)
-                end_time = asyncio.get_event_loop().time()
+                # Wait for response to be done before sending the result
+                await self._wait_for_event(_WAIT_RESPONSE_DONE, waiter=done_waiter)
+                result, start_time, end_time = await exec_task
 
                 # Send function completed event
                 await self.bridge.send_message(
@@ -509,10 +771,8 @@ class WebSocketVoiceClient:
                 )
 
                 # Create function call output item
-                from azure.ai.voicelive.models import FunctionCallOutputItem
-
                 function_output = FunctionCallOutputItem(
-                    call_id=call_id, output=json.dumps(result)
+                    call_id=call_id, output=orjson.dumps(result).decode()
                 )
 
                 # Send the result back to the conversation with proper previous_item_id
@@ -529,16 +789,16 @@ class WebSocketVoiceClient:
                 logger.error(f"Unknown function: {function_name}")
 
                 # Send function error event
-                await self.bridge.send_message(
-                    self.client_id,
+                pending.append(
                     {
                         "type": "tool_call_error",
                         "function_name": function_name,
                         "call_id": call_id,
                         "error": f"Unknown function: {function_name}",
-                        "timestamp": asyncio.get_event_loop().time(),
-                    },
+                        "timestamp": loop.time(),
+                    }
                 )
+                await self.bridge.send_messages(self.client_id, pending)
 
         except asyncio.TimeoutError:
             error_msg = (
@@ -547,64 +807,88 @@ class WebSocketVoiceClient:
             logger.error(error_msg)
 
             # Send timeout event
-            await self.bridge.send_message(
-                self.client_id,
+            pending.append(
                 {
                     "type": "tool_call_error",
                     "function_name": function_name,
                     "call_id": call_id,
                     "error": error_msg,
-                    "timestamp": asyncio.get_event_loop().time(),
-                },
+                    "timestamp": loop.time(),
+                }
             )
+            await self.bridge.send_messages(self.client_id, pending)
 
         except Exception as e:
             error_msg = f"Error executing function {function_name}: {e}"
             logger.error(error_msg)
 
             # Send error event
-            await self.bridge.send_message(
-                self.client_id,
+            pending.append(
                 {
                     "type": "tool_call_error",
                     "function_name": function_name,
                     "call_id": call_id,
                     "error": str(e),
-                    "timestamp": asyncio.get_event_loop().time(),
-                },
+                    "timestamp": loop.time(),
+                }
             )
+            await self.bridge.send_messages(self.client_id, pending)
 
         finally:
+            if exec_task is not None and not exec_task.done():
+                exec_task.cancel()
+            self._discard_waiter(args_waiter, _WAIT_FUNCTION_ARGS_DONE)
+            self._discard_waiter(done_waiter, _WAIT_RESPONSE_DONE)
             self.function_call_in_progress = False
             self.active_call_id = None
 
+    def _expect_event(self, wanted_types: frozenset) -> asyncio.Future:
+        """Register a future that _process_events resolves with the next matching event."""
+        waiter = asyncio.get_running_loop().create_future()
+        if self._event_task is not None and self._event_task.done():
+            # The receive loop has already ended; nothing will resolve it
+            waiter.set_exception(ConnectionError("Voice Live connection closed"))
+            return waiter
+        for event_type in wanted_types:
+            self._waiters[event_type].append(waiter)
+        return waiter
+
+    def _discard_waiter(self, waiter: asyncio.Future, wanted_types: frozenset):
+        if waiter.done() and not waiter.cancelled():
+            # Mark a failure nobody awaited as retrieved
+            waiter.exception()
+        for event_type in wanted_types:
+            waiters = self._waiters.get(event_type)
+            if waiters and waiter in waiters:
+                waiters.remove(waiter)
+                if not waiters:
+                    del self._waiters[event_type]
+
     async def _wait_for_event(
-        self, connection, wanted_types: set, timeout_s: float = 10.0
+        self,
+        wanted_types: frozenset,
+        timeout_s: float = 10.0,
+        waiter: Optional[asyncio.Future] = None,
     ):
-        """Wait for specific event types."""
-
-        async def _next():
-            async for event in connection:
-                # Keep essential error logging
-                if hasattr(event, "error"):
-                    logger.error(f"Event has error: {event.error}")
-                if event.type == ServerEventType.ERROR:
-                    logger.error(f"VoiceLive API Error event received: {event}")
-
-                if event.type in wanted_types:
-                    return event
+        """Wait for specific event types delivered by _process_events.
 
+        Pass a waiter from _expect_event when the event may arrive before
+        this coroutine gets to run.
+        """
+        if waiter is None:
+            waiter = self._expect_event(wanted_types)
         try:
-            result = await asyncio.wait_for(_next(), timeout=timeout_s)
-            return result
+            return await asyncio.wait_for(waiter, timeout=timeout_s)
         except asyncio.TimeoutError:
             logger.error(
-                f"Timeout waiting for event types {wanted_types} after {timeout_s}s"
+                f"Timeout waiting for event types {set(wanted_types)} after {timeout_s}s"
             )
             raise
         except Exception as e:
             logger.error(f"Error waiting for event: {e}")
             raise
+        finally:
+            self._discard_waiter(waiter, wanted_types)
 
     async def process_audio_input(self, audio_base64: str):
         """Process audio input from frontend."""
@@ -613,16 +897,24 @@ class WebSocketVoiceClient:
                 audio_base64, self.connection
             )
 
+    async def process_audio_bytes(self, raw_pcm):
+        """Process raw PCM16 audio from a frontend binary frame."""
+        if self.connection:
+            await self.audio_processor.process_input_audio_bytes(
+                raw_pcm, self.connection
+            )
+
     async def interrupt_response(self):
         """Interrupt current response and stop playback."""
         if self.connection:
             try:
                 # Stop playback on frontend
-                await self.bridge.send_message(self.client_id, {
-                    "type": "stop_playback",
-                    "reason": "manual_interrupt",
-                    "timestamp": asyncio.get_event_loop().time()
-                })
+                await self.bridge.send_stop_playback(
+                    self.client_id,
+                    _stop_playback(
+                        _STOP_PLAYBACK_MANUAL, asyncio.get_running_loop().time()
+                    ),
+                )
                 
                 # Cancel VoiceLive response
                 await self.connection.response.cancel()
@@ -634,6 +926,10 @@ class WebSocketVoiceClient:
     async def cleanup(self):
         """Clean up resources."""
         self.is_running = False
+        for task in self._function_tasks:
+            task.cancel()
+        if self._event_task is not None and self._event_task is not asyncio.current_task():
+            self._event_task.cancel()
         if self.audio_processor:
             await self.audio_processor.cleanup()
         self.connection = None
@@ -643,11 +939,10 @@ class WebSocketVoiceClient:
         """Handle user interrupting the assistant by speaking."""
         try:
             # 1. Stop current audio playback via WebSocket
-            await self.bridge.send_message(self.client_id, {
-                "type": "stop_playback",
-                "reason": "user_interruption",
-                "timestamp": asyncio.get_event_loop().time()
-            })
+            await self.bridge.send_stop_playback(
+                self.client_id,
+                _stop_playback(_STOP_PLAYBACK_USER, asyncio.get_running_loop().time()),
+            )
             
             # 2. Cancel any ongoing response from VoiceLive API
             try:
@@ -668,7 +963,7 @@ class WebSocketVoiceClient:
             # Notify frontend that user finished speaking
             await self.bridge.send_message(self.client_id, {
                 "type": "user_speech_ended",
-                "timestamp": asyncio.get_event_loop().time()
+                "timestamp": asyncio.get_running_loop().time()
             })
         except Exception as e:
             logger.error(f"Error handling speech end: {e}")
@@ -20,9 +20,13 @@ export default function useAudioPlayer() {
         audioPlayer.current?.play(pcmData);
     };
 
+    const playPcm16 = (pcmData: Int16Array) => {
+        audioPlayer.current?.play(pcmData);
+    };
+
     const stop = () => {
         audioPlayer.current?.stop();
     };
 
-    return { reset, play, stop };
+    return { reset, play, playPcm16, stop };
 }
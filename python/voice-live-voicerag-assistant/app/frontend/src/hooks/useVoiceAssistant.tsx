@@ -47,13 +47,17 @@ interface SessionEvent {
 // Audio streaming interface
 interface AudioDataEvent {
   type: 'audio_data';
-  data: string; // base64 encoded PCM audio
+  data: Int16Array; // PCM16 samples
   format: string;
   sample_rate: number;
   channels: number;
-  timestamp: number;
 }
 
+// Type tag of binary WebSocket frames carrying assistant PCM16 audio
+const WS_FRAME_AUDIO = 0x01;
+// JSON control messages arrive as UTF-8 binary frames
+const wsTextDecoder = new TextDecoder();
+
 interface WebSocketMessage {
   type: string;
   [key: string]: any;
@@ -161,11 +165,13 @@ export default function useVoiceAssistant({
   // Initialize audio player for streaming
   const audioPlayer = useAudioPlayer();
 
-  const { sendJsonMessage, readyState } = useWebSocket(
+  const { sendMessage, sendJsonMessage, readyState } = useWebSocket(
     wsEndpoint,
     {
-      onOpen: () => {
+      onOpen: (event) => {
         console.log('WebSocket connected to voice assistant');
+        // Receive binary audio frames as ArrayBuffers rather than Blobs
+        (event.target as WebSocket).binaryType = 'arraybuffer';
         // Initialize audio player when connection opens
         audioPlayer.reset();
         onWebSocketOpen?.();
@@ -240,12 +246,13 @@ export default function useVoiceAssistant({
     });
   }, [sendJsonMessage, audioPlayer]);
 
-  const sendAudio = useCallback((audioData: string) => {
-    sendJsonMessage({
-      type: 'send_audio',
-      audio: audioData
-    });
-  }, [sendJsonMessage]);
+  // Microphone PCM16 goes out as a binary frame: one type-tag byte + raw samples
+  const sendAudio = useCallback((pcmData: Uint8Array) => {
+    const frame = new Uint8Array(pcmData.length + 1);
+    frame[0] = WS_FRAME_AUDIO;
+    frame.set(pcmData, 1);
+    sendMessage(frame.buffer);
+  }, [sendMessage]);
 
   const sendAudioChunk = useCallback((audioData: string) => {
     sendJsonMessage({
@@ -265,83 +272,100 @@ export default function useVoiceAssistant({
   }, [sendJsonMessage, audioPlayer]);
 
   const onMessageReceived = useCallback((event: MessageEvent<any>) => {
-    let message: WebSocketMessage;
+    let raw: string;
+    if (event.data instanceof ArrayBuffer) {
+      const frame = event.data as ArrayBuffer;
+      if (frame.byteLength === 0) {
+        return;
+      }
+      // Audio frames: one type-tag byte followed by raw PCM16
+      if (new Uint8Array(frame, 0, 1)[0] === WS_FRAME_AUDIO) {
+        if (frame.byteLength > 1) {
+          handleAudioData(new Int16Array(frame.slice(1)));
+        }
+        return;
+      }
+      raw = wsTextDecoder.decode(frame);
+    } else {
+      raw = event.data;
+    }
+
+    let parsed: WebSocketMessage | WebSocketMessage[];
     try {
-      message = JSON.parse(event.data);
+      parsed = JSON.parse(raw);
     } catch (e) {
       console.error("Failed to parse JSON message:", e);
       return;
     }
 
-    console.log('Received message:', message.type, message);
+    // The backend batches messages queued in the same tick into one array
+    const messages = Array.isArray(parsed) ? parsed : [parsed];
+    for (const message of messages) {
+      console.log('Received message:', message.type, message);
 
-    // Handle our custom message types
-    switch (message.type) {
-      case 'session_started':
-        onSessionStarted?.(message as SessionEvent);
-        break;
+      // Handle our custom message types
+      switch (message.type) {
+        case 'session_started':
+          onSessionStarted?.(message as SessionEvent);
+          break;
         
-      case 'session_stopped':
-        onSessionStopped?.(message as SessionEvent);
-        break;
+        case 'session_stopped':
+          onSessionStopped?.(message as SessionEvent);
+          break;
         
-      case 'session_error':
-        onSessionError?.(message as SessionEvent);
-        break;
-
-      // Audio streaming
-      case 'audio_data':
-        handleAudioData(message as AudioDataEvent);
-        break;
-
-      // Tool call events
-      case 'tool_call_started':
-        onToolCallStarted?.(message as ToolCallEvent);
-        break;
+        case 'session_error':
+          onSessionError?.(message as SessionEvent);
+          break;
+
+        // Tool call events
+        case 'tool_call_started':
+          onToolCallStarted?.(message as ToolCallEvent);
+          break;
         
-      case 'tool_call_arguments':
-        onToolCallArguments?.(message as ToolCallEvent);
-        break;
+        case 'tool_call_arguments':
+          onToolCallArguments?.(message as ToolCallEvent);
+          break;
         
-      case 'tool_call_executing':
-        onToolCallExecuting?.(message as ToolCallEvent);
-        break;
+        case 'tool_call_executing':
+          onToolCallExecuting?.(message as ToolCallEvent);
+          break;
         
-      case 'tool_call_completed':
-        onToolCallCompleted?.(message as ToolCallEvent);
-        break;
+        case 'tool_call_completed':
+          onToolCallCompleted?.(message as ToolCallEvent);
+          break;
         
-      case 'tool_call_error':
-        onToolCallError?.(message as ToolCallEvent);
-        break;
-
-      case 'assistant_interrupted':
-        onAssistantInterrupted?.(message as VoiceEvent);
-        break;
-
-      case 'stop_playback':
-        // Only honor VAD-triggered stop_playback when actively listening (unmuted)
-        // This prevents muting the mic from interrupting playback
-        if (honorVadInterruptionRef.current) {
-          console.log('🛑 Stopping audio playback due to user interruption (VAD barge-in)');
-          audioPlayer.stop();
-          onAudioPlaybackStop?.();
-        } else {
-          console.log('ℹ️ Ignoring stop_playback - microphone is muted');
-        }
-        break;
+        case 'tool_call_error':
+          onToolCallError?.(message as ToolCallEvent);
+          break;
+
+        case 'assistant_interrupted':
+          onAssistantInterrupted?.(message as VoiceEvent);
+          break;
+
+        case 'stop_playback':
+          // Only honor VAD-triggered stop_playback when actively listening (unmuted)
+          // This prevents muting the mic from interrupting playback
+          if (honorVadInterruptionRef.current) {
+            console.log('🛑 Stopping audio playback due to user interruption (VAD barge-in)');
+            audioPlayer.stop();
+            onAudioPlaybackStop?.();
+          } else {
+            console.log('ℹ️ Ignoring stop_playback - microphone is muted');
+          }
+          break;
             
-      case 'user_speech_ended':
-        console.log('🎤 User finished speaking');
-        break;
-
-      // Voice Live API events (forwarded from backend)
-      case 'voice_event':
-        handleVoiceEvent(message.data, message.event_type);
-        break;
-
-      default:
-        console.log('Unknown message type:', message.type);
+        case 'user_speech_ended':
+          console.log('🎤 User finished speaking');
+          break;
+
+        // Voice Live API events (forwarded from backend)
+        case 'voice_event':
+          handleVoiceEvent(message.data, message.event_type);
+          break;
+
+        default:
+          console.log('Unknown message type:', message.type);
+      }
     }
   }, [
     onSessionStarted,
@@ -368,20 +392,19 @@ export default function useVoiceAssistant({
   ]);
 
   // Handle audio data streaming
-  const handleAudioData = useCallback((audioEvent: AudioDataEvent) => {
+  const handleAudioData = useCallback((pcmData: Int16Array) => {
     try {
-      console.log('Received audio data:', {
-        format: audioEvent.format,
-        sampleRate: audioEvent.sample_rate,
-        channels: audioEvent.channels,
-        dataLength: audioEvent.data.length
-      });
-
       // Play the audio using the audio player
-      audioPlayer.play(audioEvent.data);
+      audioPlayer.playPcm16(pcmData);
       
       // Call the custom handler if provided
-      onAudioData?.(audioEvent);
+      onAudioData?.({
+        type: 'audio_data',
+        data: pcmData,
+        format: 'pcm16',
+        sample_rate: 24000,
+        channels: 1,
+      });
       
       // Trigger playback start event on first audio chunk
       onAudioPlaybackStart?.();